@@ -0,0 +1,46 @@
+'''
+File: compare.py
+Project: benchmarks
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import argparse
+import json
+import sys
+
+
+def _key(result):
+    return (result['name'], json.dumps(result['params'], sort_keys=True))
+
+
+def load(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {_key(r): r for r in data['results'] if 'median_s' in r}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='compare two results of run.py')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    current = load(args.current)
+
+    regressions = 0
+    for key in sorted(set(baseline) & set(current)):
+        ratio = current[key]['median_s'] / baseline[key]['median_s'] if baseline[key]['median_s'] > 0 else float('inf')
+        mark = ''
+        if ratio > 1.0 + args.threshold:
+            mark = 'REGRESSION'
+            regressions += 1
+        print(f'{key[0]:<32} {key[1]:<40} {ratio:>8.3f} {mark}')
+
+    sys.exit(1 if regressions > 0 else 0)
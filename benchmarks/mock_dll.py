@@ -0,0 +1,82 @@
+'''
+File: mock_dll.py
+Project: benchmarks
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import ctypes
+
+from pyautd3 import geometry
+
+
+class MockDLL:
+    '''Stand-in for autd3capi that does no native work.
+
+    Benchmarks run against it measure only the Python-side cost (marshalling, NumPy, ctypes-like call overhead).
+    Geometry queries are answered from the devices added to each controller through AUTDAddDevice/AUTDAddDeviceQuaternion.
+    '''
+
+    def __init__(self):
+        self._controllers = {}
+        self._next_handle = 1
+
+    def _noop(self, *args):
+        # constructors (AUTDFocalPointGain, AUTDSequence, ...) get a non-null handle so the object is not closed
+        if args and isinstance(getattr(args[0], '_obj', None), ctypes.c_void_p):
+            args[0]._obj.value = self._next_handle
+            self._next_handle += 1
+        return 0
+
+    def __getattr__(self, name):
+        # every function not defined below is a no-op
+        if not name.startswith('AUTD'):
+            raise AttributeError(name)
+        return self._noop
+
+    def _devices(self, cnt):
+        return self._controllers[cnt.value]
+
+    def AUTDCreateController(self, out):
+        out._obj.value = self._next_handle
+        self._controllers[self._next_handle] = []
+        self._next_handle += 1
+
+    def AUTDFreeController(self, cnt):
+        self._controllers.pop(cnt.value, None)
+
+    def AUTDAddDevice(self, cnt, x, y, z, az1, ay, az2, group_id):
+        return self.AUTDAddDeviceQuaternion(cnt, x, y, z, *geometry.euler_to_quaternion((az1, ay, az2)), group_id)
+
+    def AUTDAddDeviceQuaternion(self, cnt, x, y, z, qw, qx, qy, qz, group_id):
+        self._devices(cnt).append(((x, y, z), (qw, qx, qy, qz)))
+        return len(self._devices(cnt)) - 1
+
+    def AUTDNumDevices(self, cnt):
+        return len(self._devices(cnt))
+
+    def AUTDNumTransducers(self, cnt):
+        return len(self._devices(cnt)) * geometry.NUM_TRANS_IN_UNIT
+
+    def AUTDWavelength(self, cnt):
+        return 8.5
+
+    def AUTDRemainingInBuffer(self, cnt):
+        return 0
+
+    def AUTDSequenceSetFreq(self, seq, freq):
+        return freq
+
+    def AUTDTransPositionByGlobal(self, cnt, idx):
+        dev = self._devices(cnt)[idx // geometry.NUM_TRANS_IN_UNIT]
+        return (ctypes.c_float * 3)(*geometry.device_transducer_positions(*dev)[idx % geometry.NUM_TRANS_IN_UNIT])
+
+    def AUTDDeviceDirection(self, cnt, idx):
+        return (ctypes.c_float * 3)(*geometry.device_direction(self._devices(cnt)[idx][1]))
+
+    def AUTDDeviceIdxForTransIdx(self, cnt, idx):
+        return idx // geometry.NUM_TRANS_IN_UNIT
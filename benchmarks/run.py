@@ -0,0 +1,196 @@
+'''
+File: run.py
+Project: benchmarks
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import pyautd3
+from pyautd3 import AUTD, Gain, Modulation, Sequence, Link, OptMethod
+from pyautd3 import gain_engine
+from pyautd3.holo import HoloSolver
+from pyautd3.modulation_builder import ModulationBuilder
+from pyautd3.nativemethods import Nativemethods
+from pyautd3.emulator import LoopbackEmulator, DEFAULT_PORT
+
+from stm_setup import circle, setup_loop, setup_batch
+
+
+def measure(fn, repeat: int = 5, number: int = 1, setup=None):
+    '''Run fn number times per round for repeat rounds and return timing statistics in seconds per call.'''
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(arg) if setup is not None else fn()
+        times.append((time.perf_counter() - start) / number)
+    return {
+        'min_s': min(times),
+        'median_s': statistics.median(times),
+        'mean_s': statistics.mean(times),
+        'ops_per_s': 1.0 / statistics.median(times) if statistics.median(times) > 0 else None,
+        'repeat': repeat,
+        'number': number,
+    }
+
+
+class Suite:
+    def __init__(self, backend: str, num_devices: int, repeat: int):
+        self.backend = backend
+        self.num_devices = num_devices
+        self.repeat = repeat
+        self.results = []
+        self.emulator = None
+
+    def controller(self):
+        autd = AUTD()
+        for i in range(self.num_devices):
+            autd.add_device([192.0 * i, 0., 0.], [0., 0., 0.])
+        if self.backend == 'emulator':
+            autd.open_with(Link.emulator_link('127.0.0.1', DEFAULT_PORT, autd))
+        return autd
+
+    def add(self, name, params, stats):
+        self.results.append({'name': name, 'params': params, **stats})
+        print(f'{name:<32} {json.dumps(params):<40} {stats["median_s"] * 1e3:>12.4f} ms', file=sys.stderr)
+
+    def bench_gain_construction(self):
+        n = 1000
+        self.add('gain.focal_point', {'n': n}, measure(lambda: [Gain.focal_point([90., 80., 150.]) for _ in range(n)], self.repeat))
+        autd = self.controller()
+        trans_pos = autd.transducer_positions()
+        points = circle(n)
+        self.add('gain_engine.focal_point', {'n': n},
+                 measure(lambda: gain_engine.focal_point(trans_pos, points, 8.5), self.repeat))
+        autd.dispose()
+
+    def bench_stm(self):
+        for size in [200, 1000, 5000]:
+            points = circle(size)
+            self.add('stm.append_stm_gain_loop', {'n': size}, self._with_controller(lambda autd: setup_loop(autd, points)))
+            self.add('stm.append_stm_gains', {'n': size}, self._with_controller(lambda autd: setup_batch(autd, points)))
+
+    def _with_controller(self, fn):
+        controllers = []
+
+        def setup():
+            autd = self.controller()
+            controllers.append(autd)
+            return autd
+
+        res = measure(fn, self.repeat, setup=setup)
+        for autd in controllers:
+            autd.finish_stm()
+            autd.dispose()
+        return res
+
+    def bench_sequence(self):
+        for size in [1000, 10000, 100000]:
+            points = circle(size)
+            self.add('sequence.add_points', {'n': size},
+                     measure(lambda seq: seq.add_points(points), self.repeat, setup=Sequence.sequence))
+
+    def bench_holo(self):
+        autd = self.controller()
+        solver = HoloSolver(autd)
+        for num_foci in [2, 4, 8, 16]:
+            foci = np.stack([[90.0 + 10.0 * np.cos(t), 80.0 + 10.0 * np.sin(t), 150.0]
+                             for t in np.linspace(0, 2 * np.pi, num_foci, endpoint=False)]).astype(np.float32)
+            amps = np.ones(num_foci, dtype=np.float32)
+            # the native library solves a holo gain when it is sent, so without a link only the construction is timed
+            native_name = 'holo.native' if self.backend == 'emulator' else 'holo.native_construct'
+            for method in OptMethod:
+                def native():
+                    gain = Gain.holo(foci, amps, method)
+                    if self.backend == 'emulator':
+                        autd.append_gain_sync(gain, True)
+                self.add(native_name, {'method': method.name, 'foci': num_foci}, measure(native, self.repeat))
+                if method in (OptMethod.NAIVE, OptMethod.GS, OptMethod.GS_PAT, OptMethod.EVD):
+                    self.add('holo.python', {'method': method.name, 'foci': num_foci},
+                             measure(lambda: solver.solve(foci, amps, method), self.repeat))
+        autd.dispose()
+
+    def bench_modulation(self):
+        builder = ModulationBuilder()
+        self.add('modulation.sine_wave', {}, measure(lambda: Modulation.sine_wave(150), self.repeat, 100))
+        self.add('modulation_builder.sine', {}, measure(lambda: builder.build(builder.sine(150)), self.repeat, 100))
+        self.add('modulation_builder.mix', {'waves': 8},
+                 measure(lambda: builder.build(builder.mix(*[builder.sine(50 * (i + 1)) for i in range(8)])), self.repeat, 10))
+
+    def bench_send(self):
+        autd = self.controller()
+        gain = Gain.focal_point([90., 80., 150.])
+        mod = Modulation.sine_wave(150)
+        seq = Sequence.circum([90., 80., 150.], [0., 0., 1.], 30.0, 200)
+        seq.set_frequency(200)
+        if self.emulator is not None:
+            self.emulator.clear()
+        self.add('send.append_gain_sync', {}, measure(lambda: autd.append_gain_sync(gain, True), self.repeat, 100))
+        self.add('send.append_modulation_sync', {}, measure(lambda: autd.append_modulation_sync(mod), self.repeat, 10))
+        self.add('send.append_sequence', {}, measure(lambda: autd.append_sequence(seq), self.repeat, 10))
+        if self.emulator is not None:
+            self.results.append({'name': 'send.emulator_frames', 'params': {},
+                                 'frames': self.emulator.num_received, 'frames_per_s': self.emulator.frame_rate()})
+        autd.dispose()
+
+    def run(self, cases):
+        if self.backend == 'mock':
+            from mock_dll import MockDLL
+            Nativemethods().dll = MockDLL()
+        elif self.backend == 'emulator':
+            self.emulator = LoopbackEmulator('127.0.0.1', DEFAULT_PORT, capacity=1 << 16)
+            self.emulator.start()
+        try:
+            for case in cases:
+                getattr(self, 'bench_' + case)()
+        finally:
+            if self.emulator is not None:
+                self.emulator.stop()
+        return self.results
+
+
+CASES = ['gain_construction', 'stm', 'sequence', 'holo', 'modulation', 'send']
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='pyautd3 benchmark suite')
+    parser.add_argument('--backend', choices=['mock', 'native', 'emulator'], default='mock',
+                        help='mock: no native work, native: library without link, emulator: library with a loopback emulator link')
+    parser.add_argument('--devices', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--cases', nargs='*', choices=CASES, default=None)
+    parser.add_argument('--output', default='-', help='path of the JSON result, or - for stdout')
+    args = parser.parse_args()
+
+    cases = args.cases or [c for c in CASES if c != 'send' or args.backend == 'emulator']
+    suite = Suite(args.backend, args.devices, args.repeat)
+    results = {
+        'pyautd3_version': pyautd3.__version__,
+        'numpy_version': np.__version__,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'backend': args.backend,
+        'num_devices': args.devices,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'results': suite.run(cases),
+    }
+    text = json.dumps(results, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text)
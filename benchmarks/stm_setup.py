@@ -0,0 +1,75 @@
+'''
+File: stm_setup.py
+Project: benchmarks
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from pyautd3 import AUTD, Gain
+from pyautd3.nativemethods import Nativemethods
+
+# the native library builds the STM gains when the STM is started, so every measurement runs through start_stm
+STM_FREQ = 1.0
+
+
+def circle(size, x=90.0, y=80.0, z=150.0, radius=30.0):
+    theta = 2 * np.pi * np.arange(size) / size
+    return np.stack([x + radius * np.cos(theta), y + radius * np.sin(theta), np.full(size, z)], axis=1).astype(np.float32)
+
+
+def create_controller(num_devices):
+    autd = AUTD()
+    for i in range(num_devices):
+        autd.add_device([192.0 * i, 0., 0.], [0., 0., 0.])
+    return autd
+
+
+def setup_loop(autd, points):
+    for p in points:
+        f = Gain.focal_point(p)
+        autd.append_stm_gain(f)
+    autd.start_stm(STM_FREQ)
+
+
+def setup_batch(autd, points):
+    autd.append_stm_gains(points)
+    autd.start_stm(STM_FREQ)
+
+
+def measure(fn, num_devices, points):
+    autd = create_controller(num_devices)
+    start = time.perf_counter()
+    fn(autd, points)
+    elapsed = time.perf_counter() - start
+    autd.finish_stm()
+    autd.dispose()
+    return elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='STM setup time of append_stm_gain loops and append_stm_gains')
+    parser.add_argument('--backend', choices=['mock', 'native'], default='native',
+                        help='mock: no native work, so only the Python-side cost is measured')
+    args = parser.parse_args()
+    if args.backend == 'mock':
+        from mock_dll import MockDLL
+        Nativemethods().dll = MockDLL()
+
+    num_devices = 1
+    print(f'{"N":>8} {"loop [ms]":>12} {"batch [ms]":>12} {"speedup":>8}')
+    for size in [10, 100, 1000, 5000, 10000]:
+        points = circle(size)
+        t_loop = measure(setup_loop, num_devices, points)
+        t_batch = measure(setup_batch, num_devices, points)
+        speedup = t_loop / t_batch if t_batch > 0 else math.inf
+        print(f'{size:>8} {t_loop * 1000:>12.2f} {t_batch * 1000:>12.2f} {speedup:>8.2f}')
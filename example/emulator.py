@@ -0,0 +1,29 @@
+'''
+File: emulator.py
+Project: example
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+from pyautd3 import AUTD, Link
+from pyautd3.emulator import LoopbackEmulator, DEFAULT_PORT
+
+from samples import runner
+
+
+if __name__ == '__main__':
+    with LoopbackEmulator('127.0.0.1', DEFAULT_PORT) as emulator:
+        autd = AUTD()
+
+        autd.add_device([0., 0., 0.], [0., 0., 0.])
+
+        link = Link.emulator_link('127.0.0.1', DEFAULT_PORT, autd)
+        autd.open_with(link)
+
+        runner.run(autd)
+
+        print(f'received {emulator.num_received} frames')
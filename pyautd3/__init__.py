@@ -11,11 +11,12 @@ Copyright (c) 2020 Hapis Lab. All rights reserved.
 
 '''
 
-import os.path
+import os
 import platform
 
 from pyautd3.autd import ModSamplingFreq, ModBufSize, Configuration, OptMethod, SDPParams, EVDParams, NLSParams
 from pyautd3.autd import Gain, Modulation, Sequence, Link, AUTD
+from pyautd3.arrays import ConversionWarning
 from pyautd3.nativemethods import Nativemethods
 
 PLATFORM = platform.system()
@@ -44,8 +45,21 @@ __all__ = [
     'Modulation',
     'Sequence',
     'AUTD',
-    'Link']
+    'Link',
+    'ConversionWarning',
+    'set_library_path']
 __version__ = '0.8.0'
 
 LIB_PATH = os.path.join(os.path.dirname(__file__), 'bin', PREFIX + 'autd3capi' + EXT)
-Nativemethods().init_dll(LIB_PATH)
+
+
+def set_library_path(path: str):
+    '''Use the native library at path instead of the bundled one. It is loaded on the first native call.
+
+    Raises RuntimeError if the library has already been loaded.
+    '''
+    Nativemethods().set_dll_location(path)
+
+
+# the library is loaded lazily, so importing pyautd3 does not require the binary
+set_library_path(os.environ.get('PYAUTD3_LIBRARY_PATH', LIB_PATH))
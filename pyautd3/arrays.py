@@ -0,0 +1,57 @@
+'''
+File: arrays.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import warnings
+from ctypes import POINTER
+import numpy as np
+
+
+class ConversionWarning(UserWarning):
+    '''Emitted when a buffer passed to the native library has to be copied because of its dtype or layout.'''
+
+
+def _is_buffer(data):
+    if isinstance(data, np.ndarray):
+        return True
+    try:
+        memoryview(data)
+    except TypeError:
+        return False
+    return True
+
+
+def as_native_array(data, dtype, width: int = 1, name: str = 'data'):
+    '''Return a C-contiguous ndarray of dtype sharing memory with data whenever possible.
+
+    Any object supporting the buffer protocol (ndarray, array.array, memoryview, ...) with the right dtype and layout
+    is passed through without copying. Otherwise it is converted, and a ConversionWarning is emitted for buffers.
+    Plain Python sequences are always converted silently.
+    If width > 1, the result has shape (N, width).
+    '''
+    dtype = np.dtype(dtype)
+    is_buffer = _is_buffer(data)
+    arr = np.asarray(data)
+    if arr.dtype != dtype or not arr.flags['C_CONTIGUOUS']:
+        if is_buffer:
+            warnings.warn(f'{name}: {arr.dtype} array ({"C-contiguous" if arr.flags["C_CONTIGUOUS"] else "non-contiguous"}) '
+                          f'is copied to C-contiguous {dtype}', ConversionWarning, stacklevel=3)
+        arr = np.ascontiguousarray(arr, dtype=dtype)
+    if width > 1:
+        if arr.size % width != 0:
+            raise ValueError(f'{name}: size {arr.size} is not a multiple of {width}')
+        arr = arr.reshape(-1, width)
+    else:
+        arr = arr.reshape(-1)
+    return arr
+
+
+def as_pointer(arr, ctype):
+    return arr.ctypes.data_as(POINTER(ctype))
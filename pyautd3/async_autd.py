@@ -0,0 +1,133 @@
+'''
+File: async_autd.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+
+from .autd import AUTD, Configuration, Gain, Link, Modulation, Sequence
+
+
+class AsyncAUTD:
+    '''asyncio facade of AUTD.
+
+    Every call is run on a dedicated single-thread executor, so calls on the wrapped controller are serialized
+    while the event loop keeps running. Many coroutines (e.g. one per connected client) can share one controller.
+    '''
+
+    def __init__(self, autd: AUTD = None):
+        self.autd = AUTD() if autd is None else autd
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pyautd3')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.dispose()
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def dispose(self):
+        if self._executor is None:
+            return
+        await self._run(self.autd.dispose)
+        self._executor.shutdown(wait=False)
+        self._executor = None
+
+    async def open_with(self, link: Link):
+        return await self._run(self.autd.open_with, link)
+
+    async def firmware_info_list(self):
+        return await self._run(self.autd.firmware_info_list)
+
+    async def add_device(self, pos, rot, group_id=0):
+        return await self._run(self.autd.add_device, pos, rot, group_id)
+
+    async def add_device_quaternion(self, pos, q, group_id=0):
+        return await self._run(self.autd.add_device_quaternion, pos, q, group_id)
+
+    async def calibrate(self, config: Configuration = Configuration()):
+        return await self._run(self.autd.calibrate, config)
+
+    async def set_delay(self, delays):
+        return await self._run(self.autd.set_delay, delays)
+
+    async def stop(self):
+        return await self._run(self.autd.stop)
+
+    async def close(self):
+        return await self._run(self.autd.close)
+
+    async def clear(self):
+        return await self._run(self.autd.clear)
+
+    async def set_silent(self, silent: bool):
+        return await self._run(self.autd.set_silent, silent)
+
+    async def set_wavelength(self, wavelength: float):
+        return await self._run(self.autd.set_wavelength, wavelength)
+
+    async def is_open(self):
+        return await self._run(self.autd.is_open)
+
+    async def is_silent(self):
+        return await self._run(self.autd.is_silent)
+
+    async def wavelength(self):
+        return await self._run(self.autd.wavelength)
+
+    async def num_devices(self):
+        return await self._run(self.autd.num_devices)
+
+    async def num_transducers(self):
+        return await self._run(self.autd.num_transducers)
+
+    async def remaining_in_buffer(self):
+        return await self._run(self.autd.remaining_in_buffer)
+
+    async def wait_for_buffer_drain(self, poll_interval: float = 0.001, timeout: float = None):
+        '''Wait until remaining_in_buffer() reaches zero. Raises asyncio.TimeoutError after timeout seconds.'''
+        async def poll():
+            while await self.remaining_in_buffer() > 0:
+                await asyncio.sleep(poll_interval)
+        await asyncio.wait_for(poll(), timeout)
+
+    async def append_gain(self, gain: Gain):
+        return await self._run(self.autd.append_gain, gain)
+
+    async def append_gain_sync(self, gain: Gain, wait_for_send: bool = False):
+        return await self._run(self.autd.append_gain_sync, gain, wait_for_send)
+
+    async def append_modulation(self, mod: Modulation):
+        return await self._run(self.autd.append_modulation, mod)
+
+    async def append_modulation_sync(self, mod: Modulation):
+        return await self._run(self.autd.append_modulation_sync, mod)
+
+    async def append_stm_gain(self, gain: Gain):
+        return await self._run(self.autd.append_stm_gain, gain)
+
+    async def append_stm_gains(self, points_or_gains, amp=1.0):
+        return await self._run(self.autd.append_stm_gains, points_or_gains, amp)
+
+    async def start_stm(self, freq):
+        return await self._run(self.autd.start_stm, freq)
+
+    async def stop_stm(self):
+        return await self._run(self.autd.stop_stm)
+
+    async def finish_stm(self):
+        return await self._run(self.autd.finish_stm)
+
+    async def append_sequence(self, seq: Sequence):
+        return await self._run(self.autd.append_sequence, seq)
@@ -12,16 +12,23 @@ Copyright (c) 2020 Hapis Lab. All rights reserved.
 '''
 
 import ctypes
-from ctypes import c_void_p, byref, Structure, c_float, c_int, c_bool
+from ctypes import c_void_p, byref, Structure, POINTER, c_float, c_int, c_bool, c_ubyte, c_ushort
 from enum import IntEnum
-import math
 import numpy as np
 
 from .nativemethods import Nativemethods
+from . import gain_engine, geometry, lut
+from .arrays import as_native_array, as_pointer
 
 NATIVE_METHODDS = Nativemethods()
 
 
+def _check_open(obj):
+    '''Raise ValueError for a closed Gain, Modulation or Sequence, whose native handle is null.'''
+    if obj.closed():
+        raise ValueError(f'{type(obj).__name__} has been closed')
+
+
 class ModSamplingFreq(IntEnum):
     SMPL_125_HZ = 125
     SMPL_250_HZ = 250
@@ -95,25 +102,57 @@ class Gain:
         self.gain_ptr = c_void_p()
 
     def __del__(self):
-        NATIVE_METHODDS.dll.AUTDDeleteGain(self.gain_ptr)
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        '''Free the native object now instead of waiting for garbage collection. Calling it again does nothing.'''
+        if self.gain_ptr:
+            NATIVE_METHODDS.dll.AUTDDeleteGain(self.gain_ptr)
+            self.gain_ptr = c_void_p()
+
+    def closed(self):
+        return not self.gain_ptr
 
     @staticmethod
     def adjust_amp(amp):
-        d = math.asin(amp) / math.pi
-        return int(511.0 * d)
+        '''Duty for a normalized amplitude (see lut.amp_to_duty).'''
+        return lut.amp_to_duty(amp)
 
     @staticmethod
     def grouped(group_ids, gains):
-        size = len(group_ids)
-        group_ids = np.array(group_ids).astype(np.int32)
-        group_ids = np.ctypeslib.as_ctypes(group_ids)
+        '''Gain that drives the devices of group group_ids[i] with gains[i] (see group_id of AUTD.add_device).'''
+        gains = list(gains)
+        if len(group_ids) != len(gains):
+            raise ValueError(f'{len(group_ids)} group ids were given for {len(gains)} gains')
+        for g in gains:
+            _check_open(g)
+        size = len(gains)
+        group_ids = as_native_array(group_ids, np.int32, name='group_ids')
+        gains_array = (c_void_p * size)(*[g.gain_ptr.value for g in gains])
 
-        gains_array = np.zeros([size]).astype(np.object)
-        for i, gain in enumerate(gains):
-            gains_array[i] = gain.gain_ptr
-        gains_array = np.ctypeslib.as_ctypes(gains_array)
+        gain = Gain()
+        NATIVE_METHODDS.dll.AUTDGroupedGain(byref(gain.gain_ptr), as_pointer(group_ids, c_int), gains_array, size)
+        # keep the sub gains alive as long as the grouped gain
+        gain._sub_gains = gains
+        return gain
+
+    @staticmethod
+    def grouped_focal_points(autd, foci, amp: float = 1.0, max_workers: int = None):
+        '''Gain with a separate focus per device group, computed in Python for all groups in parallel.
 
-        NATIVE_METHODDS.dll.AUTDGroupedGain(byref(gain.gain_ptr), group_ids, gains_array, size)
+        foci maps a group id to a focal point; devices of other groups are turned off. Unlike grouped, the sub gains
+        are never built by the native library one after another, so the build time stays flat as groups are added.
+        '''
+        wavelength = autd.wavelength()
+        builders = {gid: (lambda pos, p=p: gain_engine.focal_point(pos, p, wavelength, amp)[0]) for gid, p in foci.items()}
+        table = gain_engine.grouped(autd.transducer_positions(), autd.transducer_group_ids(), builders, max_workers)
+        return Gain.custom(table)
 
     @staticmethod
     def focal_point(pos, amp: float = 1.0):
@@ -138,44 +177,93 @@ class Gain:
         return gain
 
     @staticmethod
-    def plane_wave(pos, dir, amp: float = 1.0):
+    def plane_wave(dir, amp: float = 1.0):
         duty = Gain.adjust_amp(amp)
-        return Gain.plane_wave_with_duty(pos, dir, duty)
+        return Gain.plane_wave_with_duty(dir, duty)
 
     @staticmethod
-    def plane_wave_with_duty(pos, dir, duty: int = 255):
+    def plane_wave_with_duty(dir, duty: int = 255):
+        if np.ndim(duty) != 0:
+            raise TypeError('plane_wave takes (dir, amp) and plane_wave_with_duty takes (dir, duty); the position argument was removed')
         gain = Gain()
-        NATIVE_METHODDS.dll.AUTDPlaneWaveGain(byref(gain.gain_ptr), pos[0], pos[1], pos[2], dir[0], dir[1], dir[2], duty)
+        NATIVE_METHODDS.dll.AUTDPlaneWaveGain(byref(gain.gain_ptr), dir[0], dir[1], dir[2], duty)
         return gain
 
     @staticmethod
     def custom(data):
-        size = len(data)
-        data = np.array(data).astype(np.uint16)
-        data = np.ctypeslib.as_ctypes(data)
+        data = as_native_array(data, np.uint16, name='data')
 
         gain = Gain()
-        NATIVE_METHODDS.dll.AUTDCustomGain(byref(gain.gain_ptr), data, size)
+        NATIVE_METHODDS.dll.AUTDCustomGain(byref(gain.gain_ptr), as_pointer(data, c_ushort), data.size)
         return gain
 
     @staticmethod
-    def holo(foci, amps, method: OptMethod = OptMethod.SDP, params=None):
+    def holo(foci, amps, method: OptMethod = OptMethod.SDP, params=None, cache=None):
+        if cache is not None:
+            return cache.get_or_create(foci, amps, method, params, lambda: Gain.holo(foci, amps, method, params))
+
+        foci = as_native_array(foci, np.float32, 3, name='foci')
+        amps = as_native_array(amps, np.float32, name='amps')
         size = len(foci)
-        amps = np.array(amps).astype(np.float32)
-        amps = np.ctypeslib.as_ctypes(amps)
-        foci_array = np.zeros([size * 3]).astype(np.float32)
-        for i, focus in enumerate(foci):
-            foci_array[3 * i] = focus[0]
-            foci_array[3 * i + 1] = focus[1]
-            foci_array[3 * i + 2] = focus[2]
-        foci_array = np.ctypeslib.as_ctypes(foci_array)
+        if len(amps) != size:
+            raise ValueError(f'the number of amps ({len(amps)}) does not match the number of foci ({size})')
 
         params = None if params is None else byref(params)
 
         gain = Gain()
-        NATIVE_METHODDS.dll.AUTDHoloGain(byref(gain.gain_ptr), foci_array, amps, size, int(method), params)
+        NATIVE_METHODDS.dll.AUTDHoloGain(byref(gain.gain_ptr), as_pointer(foci, c_float), as_pointer(amps, c_float), size, int(method), params)
         return gain
 
+    @staticmethod
+    def holo_batch(autd, foci_sets, amps_sets, method: OptMethod = OptMethod.SDP, params=None, cache=None):
+        '''Create holo gains for many independent problems for the geometry of autd.
+
+        NAIVE, GS, GS_PAT and EVD are solved here with HoloSolver, one vectorized batch per number of foci, and
+        returned as custom gains. The native library solves a holo gain only when it is sent and cannot solve several
+        at once, so SDP and LM gains are created one by one and solved on send.
+        Identical problems (after quantization) are solved once and share one gain when cache (a HoloCache) is given.
+        '''
+        if len(foci_sets) != len(amps_sets):
+            raise ValueError(f'the number of foci sets ({len(foci_sets)}) does not match the number of amps sets ({len(amps_sets)})')
+
+        if method not in (OptMethod.NAIVE, OptMethod.GS, OptMethod.GS_PAT, OptMethod.EVD):
+            return [Gain.holo(foci, amps, method, params, cache) for foci, amps in zip(foci_sets, amps_sets)]
+
+        from .holo import HoloSolver
+
+        gains = [None] * len(foci_sets)
+        keys = [None] * len(foci_sets)
+        first = {}
+        batches = {}
+        for i, (foci, amps) in enumerate(zip(foci_sets, amps_sets)):
+            foci = np.asarray(foci, dtype=np.float64).reshape(-1, 3)
+            amps = np.asarray(amps, dtype=np.float64).reshape(-1)
+            if len(amps) != len(foci):
+                raise ValueError(f'the number of amps ({len(amps)}) does not match the number of foci ({len(foci)})')
+            if cache is not None:
+                keys[i] = cache.key(foci, amps, method, params)
+                if keys[i] in first:
+                    continue
+                first[keys[i]] = i
+                gains[i] = cache.get(keys[i])
+                if gains[i] is not None:
+                    continue
+            batches.setdefault(len(foci), []).append((i, foci, amps))
+
+        solver = HoloSolver(autd)
+        for problems in batches.values():
+            table = solver.solve(np.stack([f for _, f, _ in problems]), np.stack([a for _, _, a in problems]), method, params)
+            for (i, _, _), data in zip(problems, table):
+                gains[i] = Gain.custom(data)
+                if cache is not None:
+                    cache.put(keys[i], gains[i])
+
+        # problems repeated in foci_sets share the gain of their first occurrence
+        for i, gain in enumerate(gains):
+            if gain is None:
+                gains[i] = gains[first[keys[i]]]
+        return gains
+
     @staticmethod
     def transducer_test(idx: int, duty: int, phase: int):
         gain = Gain()
@@ -188,7 +276,22 @@ class Modulation:
         self.modulation_ptr = c_void_p()
 
     def __del__(self):
-        NATIVE_METHODDS.dll.AUTDDeleteModulation(self.modulation_ptr)
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        '''Free the native object now instead of waiting for garbage collection. Calling it again does nothing.'''
+        if self.modulation_ptr:
+            NATIVE_METHODDS.dll.AUTDDeleteModulation(self.modulation_ptr)
+            self.modulation_ptr = c_void_p()
+
+    def closed(self):
+        return not self.modulation_ptr
 
     @staticmethod
     def static(amp=255):
@@ -198,12 +301,10 @@ class Modulation:
 
     @staticmethod
     def custom(data):
-        size = len(data)
-        data = np.array(data).astype(np.uint16)
-        data = np.ctypeslib.as_ctypes(data)
+        data = as_native_array(data, np.uint8, name='data')
 
         mod = Modulation()
-        NATIVE_METHODDS.dll.AUTDSineModulation(byref(mod.modulation_ptr), data, size)
+        NATIVE_METHODDS.dll.AUTDCustomModulation(byref(mod.modulation_ptr), as_pointer(data, c_ubyte), data.size)
         return mod
 
     @staticmethod
@@ -242,7 +343,22 @@ class Sequence:
         self.seq_ptr = c_void_p()
 
     def __del__(self):
-        NATIVE_METHODDS.dll.AUTDDeleteSequence(self.seq_ptr)
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        '''Free the native object now instead of waiting for garbage collection. Calling it again does nothing.'''
+        if self.seq_ptr:
+            NATIVE_METHODDS.dll.AUTDDeleteSequence(self.seq_ptr)
+            self.seq_ptr = c_void_p()
+
+    def closed(self):
+        return not self.seq_ptr
 
     @staticmethod
     def sequence():
@@ -267,18 +383,11 @@ class Sequence:
         return seq
 
     def add_point(self, point):
-        NATIVE_METHODDS.dll.AUTDSequenceAppnedPoint(self.seq_ptr, point[0], point[1], point[2])
+        NATIVE_METHODDS.dll.AUTDSequenceAppendPoint(self.seq_ptr, point[0], point[1], point[2])
 
     def add_points(self, points):
-        size = len(points)
-        points_array = np.zeros([size * 3]).astype(np.float32)
-        for i, p in enumerate(points):
-            points_array[3 * i] = p[0]
-            points_array[3 * i + 1] = p[1]
-            points_array[3 * i + 2] = p[2]
-        points_array = np.ctypeslib.as_ctypes(points_array)
-
-        NATIVE_METHODDS.dll.AUTDSequenceAppnedPoint(self.seq_ptr, points_array, size)
+        points = as_native_array(points, np.float32, 3, name='points')
+        NATIVE_METHODDS.dll.AUTDSequenceAppendPoints(self.seq_ptr, as_pointer(points, c_float), len(points))
 
     def set_frequency(self, freq: float):
         return NATIVE_METHODDS.dll.AUTDSequenceSetFreq(self.seq_ptr, freq)
@@ -322,21 +431,37 @@ class Link:
     @staticmethod
     def ethercat_link(ipaddr, ams_net_id):
         link = Link()
-        NATIVE_METHODDS.dll.AUTDEtherCATLink(byref(link.link_ptr), ipaddr.encode('utf-8'), ams_net_id.encode('utf-8'))
+        NATIVE_METHODDS.dll.AUTDTwinCATLink(byref(link.link_ptr), ipaddr.encode('utf-8'), ams_net_id.encode('utf-8'))
         return link
 
     @staticmethod
     def local_ethercat_link(ipaddr, ams_net_id):
         link = Link()
-        NATIVE_METHODDS.dll.AUTDLocalEtherCATLink(byref(link.link_ptr))
+        NATIVE_METHODDS.dll.AUTDLocalTwinCATLink(byref(link.link_ptr))
+        return link
+
+    @staticmethod
+    def emulator_link(addr, port, autd):
+        link = Link()
+        NATIVE_METHODDS.dll.AUTDEmulatorLink(byref(link.link_ptr), addr.encode('utf-8'), port, autd.p_cnt)
         return link
 
 
 class AUTD:
     def __init__(self):
         self.p_cnt = c_void_p()
+        # nothing to dispose if the library fails to load
+        self.__disposed = True
         NATIVE_METHODDS.dll.AUTDCreateController(byref(self.p_cnt))
         self.__disposed = False
+        self._geometry_cache = None
+        # (pos, quaternion, group_id) of each device; autd3capi has no getter for them
+        self._devices = []
+        self._config = None
+        self._delays = None
+        self._delta_tolerance = None
+        self._last_gain_data = None
+        self._delta_stats = {'sent_frames': 0, 'skipped_frames': 0, 'sent_devices': 0, 'unchanged_devices': 0}
 
     def __del__(self):
         self.dispose()
@@ -366,28 +491,85 @@ class AUTD:
             self.__disposed = True
 
     def add_device(self, pos, rot, group_id=0):
+        self._geometry_cache = None
+        self._devices.append((tuple(pos), geometry.euler_to_quaternion(rot), group_id))
         return NATIVE_METHODDS.dll.AUTDAddDevice(self.p_cnt, pos[0], pos[1], pos[2], rot[0], rot[1], rot[2], group_id)
 
     def add_device_quaternion(self, pos, q, group_id=0):
+        self._geometry_cache = None
+        self._devices.append((tuple(pos), tuple(q), group_id))
         return NATIVE_METHODDS.dll.AUTDAddDeviceQuaternion(self.p_cnt, pos[0], pos[1], pos[2], q[0], q[1], q[2], q[3], group_id)
 
+    def _geometry(self):
+        if self._geometry_cache is None:
+            num_trans = self.num_transducers()
+            num_devices = self.num_devices()
+            positions = np.empty([num_trans, 3], dtype=np.float32)
+            directions = np.empty([num_devices, 3], dtype=np.float32)
+            dev_idx = np.empty([num_trans], dtype=np.int32)
+            for i in range(num_trans):
+                positions[i] = NATIVE_METHODDS.dll.AUTDTransPositionByGlobal(self.p_cnt, i)[0:3]
+                dev_idx[i] = NATIVE_METHODDS.dll.AUTDDeviceIdxForTransIdx(self.p_cnt, i)
+            for i in range(num_devices):
+                directions[i] = NATIVE_METHODDS.dll.AUTDDeviceDirection(self.p_cnt, i)[0:3]
+            for arr in (positions, directions, dev_idx):
+                arr.setflags(write=False)
+            self._geometry_cache = (positions, directions, dev_idx)
+        return self._geometry_cache
+
+    def transducer_positions(self):
+        '''Global positions of all transducers, shape (num_transducers, 3). The returned array is read-only.'''
+        return self._geometry()[0]
+
+    def device_directions(self):
+        '''Direction (normal) of each device, shape (num_devices, 3). The returned array is read-only.'''
+        return self._geometry()[1]
+
+    def device_index_map(self):
+        '''Index of the device each transducer belongs to, shape (num_transducers,). The returned array is read-only.'''
+        return self._geometry()[2]
+
+    def device_group_ids(self):
+        '''group_id of each device, in the order the devices were added.'''
+        return np.array([d[2] for d in self._devices], dtype=np.int32)
+
+    def transducer_group_ids(self):
+        '''group_id of the device of each transducer, shape (num_transducers,).'''
+        return self.device_group_ids()[self.device_index_map()]
+
+    def device_poses(self):
+        '''Positions (num_devices, 3) and (w, x, y, z) rotations (num_devices, 4) of the devices, in the order they were added.'''
+        pos = np.array([d[0] for d in self._devices], dtype=np.float64).reshape(-1, 3)
+        q = np.array([d[1] for d in self._devices], dtype=np.float64).reshape(-1, 4)
+        return pos, q
+
+    def last_configuration(self):
+        '''The Configuration of the last calibrate call, or None.'''
+        return self._config
+
+    def last_delays(self):
+        '''The delays of the last set_delay call as a read-only uint16 array, or None.'''
+        return self._delays
+
     def calibrate(self, config: Configuration = Configuration()):
+        self._config = config
         return NATIVE_METHODDS.dll.AUTDCalibrate(self.p_cnt, int(config.mod_sample_freq), int(config.mod_buf_size))
 
     def set_delay(self, delays):
-        size = len(delays)
-        data = np.array(delays).astype(np.uint16)
-        data = np.ctypeslib.as_ctypes(data)
-
-        NATIVE_METHODDS.dll.AUTDSetDelay(self.p_cnt, data, size)
+        delays = as_native_array(delays, np.uint16, name='delays')
+        NATIVE_METHODDS.dll.AUTDSetDelay(self.p_cnt, as_pointer(delays, c_ushort), delays.size)
+        self._delays = np.array(delays)
+        self._delays.setflags(write=False)
 
     def stop(self):
+        self._last_gain_data = None
         NATIVE_METHODDS.dll.AUTDStop(self.p_cnt)
 
     def close(self):
         NATIVE_METHODDS.dll.AUTDCloseController(self.p_cnt)
 
     def clear(self):
+        self._last_gain_data = None
         NATIVE_METHODDS.dll.AUTDClear(self.p_cnt)
 
     def _free(self):
@@ -418,20 +600,121 @@ class AUTD:
         return NATIVE_METHODDS.dll.AUTDRemainingInBuffer(self.p_cnt)
 
     def append_gain(self, gain: Gain):
+        _check_open(gain)
+        self._last_gain_data = None
         NATIVE_METHODDS.dll.AUTDAppendGain(self.p_cnt, gain.gain_ptr)
 
     def append_gain_sync(self, gain: Gain, wait_for_send: bool = False):
+        _check_open(gain)
+        self._last_gain_data = None
+        NATIVE_METHODDS.dll.AUTDAppendGainSync(self.p_cnt, gain.gain_ptr, wait_for_send)
+
+    def set_delta_mode(self, enabled: bool = True, phase_tolerance: int = 0, duty_tolerance: int = 0):
+        '''Skip sends of packed duty/phase data through append_gain_data_sync that would not change any device.
+
+        A device is unchanged if every phase differs from the last sent one by at most phase_tolerance (circularly, in
+        1/255 of a cycle) and every duty by at most duty_tolerance. Unchanged devices keep exactly the last sent data,
+        so errors within the tolerance do not accumulate. Sending a Gain object, stop() and clear() reset the state.
+        '''
+        self._delta_tolerance = (phase_tolerance, duty_tolerance) if enabled else None
+        self._last_gain_data = None
+
+    def delta_stats(self):
+        '''Counts of frames sent and skipped by append_gain_data_sync, and of devices whose data was changed or kept.'''
+        return dict(self._delta_stats)
+
+    def _changed_devices(self, data):
+        phase_tolerance, duty_tolerance = self._delta_tolerance
+        last = self._last_gain_data
+        d_phase = np.abs((data & 0xFF).astype(np.int16) - (last & 0xFF).astype(np.int16))
+        d_phase = np.minimum(d_phase, lut.PHASE_PERIOD - d_phase)
+        d_duty = np.abs((data >> 8).astype(np.int16) - (last >> 8).astype(np.int16))
+        changed = (d_phase > phase_tolerance) | (d_duty > duty_tolerance)
+        return changed.reshape(self.num_devices(), -1).any(axis=1)
+
+    def append_gain_data_sync(self, data, wait_for_send: bool = False):
+        '''Send packed duty/phase data (see gain_engine) of all transducers as a gain.
+
+        In delta mode (see set_delta_mode), returns False without sending if no device would change.
+        autd3capi always transmits whole frames, so when some devices changed the others are still sent,
+        with their last data.
+        '''
+        data = as_native_array(data, np.uint16, name='data')
+        if data.shape != (self.num_transducers(),):
+            raise ValueError(f'gain data must have shape ({self.num_transducers()},), but got {data.shape}')
+        if self._delta_tolerance is not None and self._last_gain_data is not None:
+            changed = self._changed_devices(data)
+            num_changed = int(changed.sum())
+            self._delta_stats['unchanged_devices'] += len(changed) - num_changed
+            if num_changed == 0:
+                self._delta_stats['skipped_frames'] += 1
+                return False
+            self._delta_stats['sent_devices'] += num_changed
+            data = np.where(changed[self.device_index_map()], data, self._last_gain_data)
+        else:
+            self._delta_stats['sent_devices'] += self.num_devices()
+        gain = Gain.custom(data)
         NATIVE_METHODDS.dll.AUTDAppendGainSync(self.p_cnt, gain.gain_ptr, wait_for_send)
+        self._delta_stats['sent_frames'] += 1
+        if self._delta_tolerance is not None:
+            self._last_gain_data = np.array(data, dtype=np.uint16)
+        return True
 
     def append_modulation(self, mod: Modulation):
+        _check_open(mod)
         NATIVE_METHODDS.dll.AUTDAppendModulation(self.p_cnt, mod.modulation_ptr)
 
     def append_modulation_sync(self, mod: Modulation):
+        _check_open(mod)
         NATIVE_METHODDS.dll.AUTDAppendModulationSync(self.p_cnt, mod.modulation_ptr)
 
     def append_stm_gain(self, gain: Gain):
+        _check_open(gain)
         NATIVE_METHODDS.dll.AUTDAppendSTMGain(self.p_cnt, gain.gain_ptr)
 
+    def append_stm_gains(self, points_or_gains, amp=1.0):
+        '''Append a whole STM buffer in one call.
+
+        points_or_gains is either a list of Gain, an (N, 3) array of focal points, or an (N, num_transducers) uint16 array
+        of packed duty/phase data (see gain_engine). autd3capi has no bulk STM append, so every frame is still one native
+        gain: focal points are built by the native library as with Gain.focal_point (amp is a scalar or one value per
+        point), and a table is converted once and passed row by row without copying.
+        '''
+        if len(points_or_gains) == 0:
+            return
+        dll = NATIVE_METHODDS.dll
+        if isinstance(points_or_gains[0], Gain):
+            # check all gains first so that a closed one does not leave a partial buffer
+            for gain in points_or_gains:
+                _check_open(gain)
+            for gain in points_or_gains:
+                dll.AUTDAppendSTMGain(self.p_cnt, gain.gain_ptr)
+            return
+
+        data = np.asarray(points_or_gains)
+        # the controller keeps its own reference to each native gain, so one handle is reused and freed right after appending
+        gain_ptr = c_void_p()
+
+        # a device has 249 transducers, so rows of 3 values are always focal points, whatever their dtype
+        if data.shape[-1] == 3:
+            points = data.reshape(-1, 3).astype(np.float64).tolist()
+            duties = np.broadcast_to(Gain.adjust_amp(np.asarray(amp, dtype=np.float64)), (len(points),)).tolist()
+            for (x, y, z), duty in zip(points, duties):
+                dll.AUTDFocalPointGain(byref(gain_ptr), x, y, z, duty)
+                dll.AUTDAppendSTMGain(self.p_cnt, gain_ptr)
+                dll.AUTDDeleteGain(gain_ptr)
+            return
+
+        if data.ndim != 2 or data.shape[1] != self.num_transducers():
+            raise ValueError(f'gain data must have shape (N, {self.num_transducers()}), but got {data.shape}')
+        table = as_native_array(data, np.uint16, data.shape[1], name='gain data')
+        row_type = POINTER(c_ushort)
+        base, stride, size = table.ctypes.data, table.strides[0], table.shape[1]
+        for i in range(len(table)):
+            dll.AUTDCustomGain(byref(gain_ptr), ctypes.cast(base + i * stride, row_type), size)
+            dll.AUTDAppendSTMGain(self.p_cnt, gain_ptr)
+            dll.AUTDDeleteGain(gain_ptr)
+
     def start_stm(self, freq):
         NATIVE_METHODDS.dll.AUTDStartSTModulation(self.p_cnt, freq)
 
@@ -442,4 +725,5 @@ class AUTD:
         NATIVE_METHODDS.dll.AUTDFinishSTModulation(self.p_cnt)
 
     def append_sequence(self, seq: Sequence):
+        _check_open(seq)
         NATIVE_METHODDS.dll.AUTDAppendSequence(self.p_cnt, seq.seq_ptr)
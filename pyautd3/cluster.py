@@ -0,0 +1,158 @@
+'''
+File: cluster.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import numpy as np
+
+from .autd import AUTD, Configuration, Gain, Modulation
+from .instrumentation import LatencyHistogram
+
+
+class AUTDCluster:
+    '''Several AUTD controllers, each with its own link, driven in parallel.
+
+    Every operation is fanned out to all controllers on a thread pool with one worker per controller; ctypes releases
+    the GIL during native calls, so the sends overlap. The latency of each operation on each controller is recorded
+    and reported by latency().
+
+    A native gain is built for the geometry of the controller it is sent to, so one Gain object cannot be shared
+    between controllers. Gains and modulations are therefore passed as a list with one object per controller, or as
+    a factory called as factory(index, autd) on the worker of each controller.
+    '''
+
+    def __init__(self, controllers=None, max_workers: int = None):
+        self.controllers = []
+        self._max_workers = max_workers
+        self._executor = None
+        self._histograms = []
+        self._lock = threading.Lock()
+        for autd in controllers or []:
+            self.add(autd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.dispose()
+
+    def __len__(self):
+        return len(self.controllers)
+
+    def __getitem__(self, idx):
+        return self.controllers[idx]
+
+    def add(self, autd: AUTD):
+        '''Add a controller and return its index in the cluster.'''
+        with self._lock:
+            self.controllers.append(autd)
+            self._histograms.append({})
+            index = len(self.controllers) - 1
+            # the pool is sized for the controllers; in-flight tasks take the lock, so shut it down after releasing it
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        return index
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                workers = self._max_workers or max(len(self.controllers), 1)
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pyautd3-cluster')
+            return self._executor
+
+    def _fan_out(self, name, fn):
+        '''Call fn(index, autd) for every controller in parallel and return the results in controller order.'''
+        def run(i):
+            start = time.perf_counter()
+            try:
+                return fn(i, self.controllers[i])
+            finally:
+                elapsed = int((time.perf_counter() - start) * 1e9)
+                with self._lock:
+                    self._histograms[i].setdefault(name, LatencyHistogram()).record(elapsed)
+
+        if len(self.controllers) == 1:
+            return [run(0)]
+        return list(self._pool().map(run, range(len(self.controllers))))
+
+    def _per_controller(self, objs, cls):
+        if callable(objs) and not isinstance(objs, cls):
+            return objs
+        if isinstance(objs, cls):
+            if len(self.controllers) > 1:
+                raise ValueError(f'one {cls.__name__} cannot be shared between controllers; pass a list or a factory')
+            objs = [objs]
+        if len(objs) != len(self.controllers):
+            raise ValueError(f'{len(objs)} {cls.__name__} objects were given for {len(self.controllers)} controllers')
+        return lambda i, autd: objs[i]
+
+    def append_gain_sync(self, gains, wait_for_send: bool = False):
+        factory = self._per_controller(gains, Gain)
+        self._fan_out('append_gain_sync', lambda i, autd: autd.append_gain_sync(factory(i, autd), wait_for_send))
+
+    def append_modulation_sync(self, mods):
+        factory = self._per_controller(mods, Modulation)
+        self._fan_out('append_modulation_sync', lambda i, autd: autd.append_modulation_sync(factory(i, autd)))
+
+    def stop(self):
+        self._fan_out('stop', lambda i, autd: autd.stop())
+
+    def calibrate(self, config: Configuration = Configuration()):
+        '''Calibrate all controllers and return the result of each.'''
+        return self._fan_out('calibrate', lambda i, autd: autd.calibrate(config))
+
+    def clear(self):
+        self._fan_out('clear', lambda i, autd: autd.clear())
+
+    def num_transducers(self):
+        return sum(autd.num_transducers() for autd in self.controllers)
+
+    def transducer_offsets(self):
+        '''Index of the first transducer of each controller in the cluster-wide transducer order, plus the total.'''
+        return np.cumsum([0] + [autd.num_transducers() for autd in self.controllers])
+
+    def transducer_positions(self):
+        '''Global positions of all transducers of all controllers, concatenated in controller order.'''
+        return np.concatenate([autd.transducer_positions() for autd in self.controllers])
+
+    def split(self, data):
+        '''Split cluster-wide packed duty/phase data (see gain_engine) into one array per controller.'''
+        data = np.asarray(data, dtype=np.uint16)
+        offsets = self.transducer_offsets()
+        if data.shape[-1] != offsets[-1]:
+            raise ValueError(f'gain data must have {offsets[-1]} transducers, but got {data.shape[-1]}')
+        return [data[..., offsets[i]:offsets[i + 1]] for i in range(len(self.controllers))]
+
+    def append_gain_data_sync(self, data, wait_for_send: bool = False):
+        '''Send cluster-wide packed duty/phase data, e.g. computed by gain_engine from transducer_positions().'''
+        parts = self.split(data)
+        self.append_gain_sync(lambda i, autd: Gain.custom(parts[i]), wait_for_send)
+
+    def latency(self):
+        '''Latency statistics of each operation, one dict per controller (see LatencyHistogram.to_dict).'''
+        with self._lock:
+            return [{name: hist.to_dict() for name, hist in hists.items()} for hists in self._histograms]
+
+    def reset_latency(self):
+        with self._lock:
+            for hists in self._histograms:
+                hists.clear()
+
+    def dispose(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        for autd in self.controllers:
+            autd.dispose()
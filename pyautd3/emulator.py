@@ -0,0 +1,161 @@
+'''
+File: emulator.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+from collections import deque, namedtuple
+from enum import IntEnum, IntFlag
+import socket
+import threading
+import time
+import numpy as np
+
+from .geometry import NUM_TRANS_IN_UNIT
+
+DEFAULT_PORT = 50632
+HEADER_SIZE = 128
+MOD_FRAME_SIZE = 124
+
+
+class ControlFlags(IntFlag):
+    NONE = 0
+    LOOP_BEGIN = 1 << 0
+    LOOP_END = 1 << 1
+    MOD_BEGIN = 1 << 2
+    SILENT = 1 << 3
+    FORCE_FAN = 1 << 4
+    SEQ_MODE = 1 << 5
+    SEQ_BEGIN = 1 << 6
+    SEQ_END = 1 << 7
+
+
+class Command(IntEnum):
+    OP = 0x00
+    READ_CPU_VER_LSB = 0x02
+    READ_CPU_VER_MSB = 0x03
+    READ_FPGA_VER_LSB = 0x04
+    READ_FPGA_VER_MSB = 0x05
+    SEQ_MODE = 0x06
+    INIT_MOD_CLOCK = 0x07
+    CLEAR = 0x09
+    SET_DELAY = 0x0A
+    PAUSE = 0x0B
+    RESUME = 0x0C
+    EMULATOR_SET_GEOMETRY = 0xFF
+
+
+class Frame(namedtuple('Frame', ['timestamp', 'msg_id', 'control_flags', 'command', 'mod', 'body'])):
+    '''A frame sent by the controller: global header fields, modulation chunk and raw body.'''
+    __slots__ = ()
+
+    @staticmethod
+    def parse(buf, timestamp):
+        mod_size = min(buf[3], MOD_FRAME_SIZE)
+        return Frame(timestamp, buf[0], ControlFlags(buf[1]), buf[2], bytes(buf[4:4 + mod_size]), bytes(buf[HEADER_SIZE:]))
+
+    def gain(self):
+        '''Body as packed duty/phase data, shape (num_devices, 249).'''
+        data = np.frombuffer(self.body, dtype=np.uint16)
+        return data[:len(data) - len(data) % NUM_TRANS_IN_UNIT].reshape(-1, NUM_TRANS_IN_UNIT)
+
+    def geometry(self):
+        '''Body of an EMULATOR_SET_GEOMETRY frame as (num_devices, 3, 3): origin, right and up vector of each device.'''
+        data = np.frombuffer(self.body, dtype=np.float32)
+        return data[:len(data) - len(data) % 9].reshape(-1, 3, 3)
+
+
+class LoopbackEmulator:
+    '''Pure-Python stand-in for the AUTD emulator.
+
+    Listens on the UDP port used by Link.emulator_link and stores every received frame in a ring buffer of the
+    given capacity, so that frames can be inspected and the send rate measured without EtherCAT hardware.
+    '''
+
+    def __init__(self, addr: str = '127.0.0.1', port: int = DEFAULT_PORT, capacity: int = 4096):
+        self.addr = addr
+        self.port = port
+        self._frames = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._sock = None
+        self._thread = None
+        self._running = False
+        self.num_received = 0
+        self.num_overwritten = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        if self._running:
+            return
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((self.addr, self.port))
+        self._sock.settimeout(0.1)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._thread.join()
+        self._sock.close()
+        self._sock = None
+
+    def _run(self):
+        while self._running:
+            try:
+                buf, _ = self._sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            if len(buf) < 4:
+                continue
+            frame = Frame.parse(buf, time.perf_counter())
+            with self._cond:
+                if len(self._frames) == self._frames.maxlen:
+                    self.num_overwritten += 1
+                self._frames.append(frame)
+                self.num_received += 1
+                self._cond.notify_all()
+
+    def frames(self, command=None):
+        with self._lock:
+            frames = list(self._frames)
+        if command is not None:
+            frames = [f for f in frames if f.command == command]
+        return frames
+
+    def last_frame(self):
+        with self._lock:
+            return self._frames[-1] if self._frames else None
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self.num_received = 0
+            self.num_overwritten = 0
+
+    def wait_for(self, count: int, timeout: float = 1.0):
+        '''Wait until at least count frames have been received since the last clear.'''
+        with self._cond:
+            return self._cond.wait_for(lambda: self.num_received >= count, timeout)
+
+    def frame_rate(self):
+        '''Frames per second over the frames currently held in the ring buffer.'''
+        with self._lock:
+            if len(self._frames) < 2:
+                return 0.0
+            elapsed = self._frames[-1].timestamp - self._frames[0].timestamp
+            return (len(self._frames) - 1) / elapsed if elapsed > 0 else 0.0
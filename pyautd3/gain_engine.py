@@ -0,0 +1,134 @@
+'''
+File: gain_engine.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from . import lut
+
+
+def _as_vectors(v, name):
+    v = np.asarray(v, dtype=np.float64)
+    if v.ndim == 1:
+        v = v.reshape(1, 3)
+    if v.ndim != 2 or v.shape[1] != 3:
+        raise ValueError(f'{name} must have shape (3,) or (N, 3), but got {v.shape}')
+    return v
+
+
+def _as_per_frame(v, n):
+    v = np.asarray(v)
+    return np.broadcast_to(v.reshape(-1, 1) if v.ndim == 1 else v, (n, 1))
+
+
+def adjust_amp(amp):
+    '''Vectorized version of Gain.adjust_amp.'''
+    return lut.amp_to_duty(np.asarray(amp, dtype=np.float64))
+
+
+def phase_from_distance(dist, wavelength: float):
+    f_phase = np.mod(dist, wavelength) / wavelength
+    return np.round(255.0 * (1.0 - f_phase)).astype(np.uint16) & 0xFF
+
+
+def pack(phase, duty):
+    '''Pack phase and duty into the uint16 format taken by Gain.custom (duty in the upper byte).'''
+    return (np.asarray(duty, dtype=np.uint16) << 8) | np.asarray(phase, dtype=np.uint16)
+
+
+def _to_table(dist, wavelength, duty):
+    phase = phase_from_distance(dist, wavelength)
+    duty = _as_per_frame(np.asarray(duty, dtype=np.uint16), dist.shape[0])
+    return pack(phase, duty)
+
+
+def focal_point_with_duty(trans_pos, points, wavelength: float, duty=255):
+    '''Compute focal point gains for N points at once.
+
+    trans_pos is the (num_transducers, 3) transducer positions, points is (N, 3) and duty is a scalar or (N,).
+    Returns a (N, num_transducers) uint16 array; each row can be passed to Gain.custom.
+    '''
+    trans_pos = _as_vectors(trans_pos, 'trans_pos')
+    points = _as_vectors(points, 'points')
+    diff = trans_pos[np.newaxis, :, :] - points[:, np.newaxis, :]
+    dist = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+    return _to_table(dist, wavelength, duty)
+
+
+def focal_point(trans_pos, points, wavelength: float, amp=1.0):
+    return focal_point_with_duty(trans_pos, points, wavelength, adjust_amp(amp))
+
+
+def plane_wave_with_duty(trans_pos, dir, wavelength: float, duty=255):
+    '''Plane waves along dir (3,) or (N, 3) with the phase referenced to the origin, as AUTDPlaneWaveGain.'''
+    trans_pos = _as_vectors(trans_pos, 'trans_pos')
+    dir = _as_vectors(dir, 'dir')
+    dir = dir / np.linalg.norm(dir, axis=1, keepdims=True)
+    return _to_table(dir @ trans_pos.T, wavelength, duty)
+
+
+def plane_wave(trans_pos, dir, wavelength: float, amp=1.0):
+    return plane_wave_with_duty(trans_pos, dir, wavelength, adjust_amp(amp))
+
+
+def bessel_beam_with_duty(trans_pos, pos, dir, theta_z, wavelength: float, duty=255):
+    trans_pos = _as_vectors(trans_pos, 'trans_pos')
+    pos = _as_vectors(pos, 'pos')
+    dir = _as_vectors(dir, 'dir')
+    n = max(len(pos), len(dir), np.size(theta_z))
+    pos = np.broadcast_to(pos, (n, 3))
+    dir = np.broadcast_to(dir / np.linalg.norm(dir, axis=1, keepdims=True), (n, 3))
+    theta_z = np.broadcast_to(np.asarray(theta_z, dtype=np.float64).reshape(-1), (n,))
+
+    # rotate each frame so that dir is aligned with the z axis (same construction as the native BesselBeamGain)
+    v = np.stack([dir[:, 1], -dir[:, 0], np.zeros(n)], axis=1)
+    v_norm = np.linalg.norm(v, axis=1)
+    theta_w = np.arcsin(np.clip(v_norm, 0.0, 1.0))
+    v = v / np.where(v_norm > 0, v_norm, 1.0)[:, np.newaxis]
+
+    r = trans_pos[np.newaxis, :, :] - pos[:, np.newaxis, :]
+    v_x_r = np.cross(r, v[:, np.newaxis, :])
+    cos_w = np.cos(theta_w)[:, np.newaxis, np.newaxis]
+    sin_w = np.sin(theta_w)[:, np.newaxis, np.newaxis]
+    v_dot_r = np.einsum('ik,ijk->ij', v, r)[:, :, np.newaxis]
+    rr = cos_w * r + sin_w * v_x_r + v_dot_r * (1.0 - cos_w) * v[:, np.newaxis, :]
+    dist = np.sin(theta_z)[:, np.newaxis] * np.sqrt(rr[:, :, 0] ** 2 + rr[:, :, 1] ** 2) - np.cos(theta_z)[:, np.newaxis] * rr[:, :, 2]
+    return _to_table(dist, wavelength, duty)
+
+
+def bessel_beam(trans_pos, pos, dir, theta_z, wavelength: float, amp=1.0):
+    return bessel_beam_with_duty(trans_pos, pos, dir, theta_z, wavelength, adjust_amp(amp))
+
+
+def grouped(trans_pos, trans_groups, builders, max_workers: int = None):
+    '''Assemble one gain from per-group sub gains computed in parallel.
+
+    trans_groups is the group id of each transducer (see AUTD.transducer_group_ids). builders maps a group id to a
+    function taking the (M, 3) positions of the M transducers of that group and returning their (M,) uint16 data.
+    Transducers of groups without a builder are turned off. Returns a (num_transducers,) uint16 array.
+    '''
+    trans_pos = _as_vectors(trans_pos, 'trans_pos')
+    trans_groups = np.asarray(trans_groups)
+    indices = {gid: np.flatnonzero(trans_groups == gid) for gid in builders}
+    table = np.zeros(len(trans_pos), dtype=np.uint16)
+
+    def build(gid):
+        table[indices[gid]] = builders[gid](trans_pos[indices[gid]])
+
+    if len(builders) <= 1:
+        for gid in builders:
+            build(gid)
+    else:
+        # NumPy releases the GIL in the heavy parts, so the groups are computed concurrently
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(build, builders))
+    return table
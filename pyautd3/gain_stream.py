@@ -0,0 +1,171 @@
+'''
+File: gain_stream.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+from collections import deque
+import threading
+import time
+
+from .autd import AUTD, Gain
+
+
+class GainStream:
+    '''Real-time gain streaming with a bounded queue between generation and submission.
+
+    Gains are generated on one thread, either by calling producer() repeatedly (return None to finish)
+    or by push() from the caller, and submitted to the controller on another thread. The queue holds at most
+    queue_size frames (2 by default, i.e. double-buffering). When it is full, the oldest frame is dropped if
+    drop_stale is True (the newest frame wins); otherwise the producer blocks. Before each submission the
+    submitter waits until remaining_in_buffer() is at most max_remaining, so frames never pile up in the controller.
+    Packed duty/phase arrays are converted with Gain.custom on the producer side.
+    If the producer or a submission raises, the stream stops, the exception is kept in error and raised by stop().
+    '''
+
+    def __init__(self, autd: AUTD, producer=None, queue_size: int = 2, max_remaining: int = 1,
+                 drop_stale: bool = True, poll_interval: float = 0.0002, rate_window: float = 1.0):
+        self.autd = autd
+        self.producer = producer
+        self.queue_size = queue_size
+        self.max_remaining = max_remaining
+        self.drop_stale = drop_stale
+        self.poll_interval = poll_interval
+        self.rate_window = rate_window
+        self.produced = 0
+        self.submitted = 0
+        self.dropped = 0
+        self.error = None
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._submit_times = deque()
+        self._running = False
+        self._finished = False
+        self._threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._finished = False
+        self.error = None
+        self._threads = [threading.Thread(target=self._run, args=(self._submit_loop,), daemon=True)]
+        if self.producer is not None:
+            self._threads.append(threading.Thread(target=self._run, args=(self._produce_loop,), daemon=True))
+        for th in self._threads:
+            th.start()
+
+    def stop(self, drain: bool = False):
+        '''Stop the stream. If drain, frames already queued are submitted first.
+
+        Raises the exception that stopped the stream, if any, from the first stop() after it.
+        '''
+        with self._cond:
+            self._finished = True
+            if not drain:
+                self._running = False
+                self._queue.clear()
+            self._cond.notify_all()
+        threads, self._threads = self._threads, []
+        for th in threads:
+            th.join()
+        self._running = False
+        if threads and self.error is not None:
+            raise self.error
+
+    def push(self, gain):
+        '''Queue a Gain or packed duty/phase data. Returns False if the stream is stopped.'''
+        if not isinstance(gain, Gain):
+            gain = Gain.custom(gain)
+        with self._cond:
+            if not self.drop_stale:
+                self._cond.wait_for(lambda: len(self._queue) < self.queue_size or not self._running)
+            if not self._running:
+                return False
+            if len(self._queue) >= self.queue_size:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(gain)
+            self.produced += 1
+            self._cond.notify_all()
+        return True
+
+    def _run(self, loop):
+        try:
+            loop()
+        except Exception as e:
+            # stop the stream and release blocked producers; the first error is raised by stop()
+            with self._cond:
+                if self.error is None:
+                    self.error = e
+                self._running = False
+                self._queue.clear()
+                self._cond.notify_all()
+
+    def _produce_loop(self):
+        while self._running and not self._finished:
+            gain = self.producer()
+            if gain is None:
+                with self._cond:
+                    self._finished = True
+                    self._cond.notify_all()
+                return
+            if not self.push(gain):
+                return
+
+    def _submit_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._finished or not self._running)
+                if not self._running or (not self._queue and self._finished):
+                    return
+            while self.autd.remaining_in_buffer() > self.max_remaining:
+                if not self._running:
+                    return
+                time.sleep(self.poll_interval)
+            with self._cond:
+                if not self._queue:
+                    continue
+                gain = self._queue.popleft()
+                self._cond.notify_all()
+            self.autd.append_gain(gain)
+            now = time.perf_counter()
+            with self._cond:
+                self.submitted += 1
+                self._submit_times.append(now)
+                while self._submit_times and now - self._submit_times[0] > self.rate_window:
+                    self._submit_times.popleft()
+
+    def queue_depth(self):
+        with self._cond:
+            return len(self._queue)
+
+    def frame_rate(self):
+        '''Submitted frames per second over the last rate_window seconds.'''
+        with self._cond:
+            if len(self._submit_times) < 2:
+                return 0.0
+            elapsed = self._submit_times[-1] - self._submit_times[0]
+            return (len(self._submit_times) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        return {
+            'produced': self.produced,
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'queue_depth': self.queue_depth(),
+            'frame_rate': self.frame_rate(),
+            'error': self.error,
+        }
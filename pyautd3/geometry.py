@@ -0,0 +1,95 @@
+'''
+File: geometry.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import hashlib
+import math
+import numpy as np
+
+NUM_TRANS_IN_UNIT = 249
+NUM_TRANS_X = 18
+NUM_TRANS_Y = 14
+TRANS_SIZE_MM = 10.16
+AUTD_WIDTH = 192.0
+AUTD_HEIGHT = 151.4
+
+
+def is_missing_transducer(x: int, y: int):
+    return y == 1 and (x == 1 or x == 2 or x == 16)
+
+
+def _build_local_positions():
+    res = []
+    for y in range(NUM_TRANS_Y):
+        for x in range(NUM_TRANS_X):
+            if not is_missing_transducer(x, y):
+                res.append([x * TRANS_SIZE_MM, y * TRANS_SIZE_MM, 0.0])
+    res = np.array(res, dtype=np.float64)
+    res.setflags(write=False)
+    return res
+
+
+_LOCAL_POSITIONS = _build_local_positions()
+
+
+def local_transducer_positions():
+    '''Positions of the transducers of one device in its local frame, shape (249, 3).'''
+    return _LOCAL_POSITIONS
+
+
+def _quaternion_mul(a, b):
+    aw, ax, ay, az = a
+    bw, bx, by, bz = b
+    return (aw * bw - ax * bx - ay * by - az * bz,
+            aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw)
+
+
+def euler_to_quaternion(rot):
+    '''Convert ZYZ euler angles (as taken by AUTD.add_device) to a (w, x, y, z) quaternion.'''
+    qz1 = (math.cos(rot[0] / 2), 0.0, 0.0, math.sin(rot[0] / 2))
+    qy = (math.cos(rot[1] / 2), 0.0, math.sin(rot[1] / 2), 0.0)
+    qz2 = (math.cos(rot[2] / 2), 0.0, 0.0, math.sin(rot[2] / 2))
+    return _quaternion_mul(_quaternion_mul(qz1, qy), qz2)
+
+
+def quaternion_to_matrix(q):
+    w, x, y, z = q
+    n = math.sqrt(w * w + x * x + y * y + z * z)
+    w, x, y, z = w / n, x / n, y / n, z / n
+    return np.array([[1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+                     [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+                     [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)]], dtype=np.float64)
+
+
+def device_transducer_positions(pos, q):
+    '''Global positions of the transducers of a device placed at pos with rotation q, shape (249, 3).'''
+    rot = quaternion_to_matrix(q)
+    return _LOCAL_POSITIONS @ rot.T + np.asarray(pos, dtype=np.float64)
+
+
+def device_direction(q):
+    return quaternion_to_matrix(q)[:, 2].copy()
+
+
+def transducer_positions(devices):
+    '''Global positions of all transducers, shape (num_devices * 249, 3).
+
+    devices is a sequence of (pos, q) pairs in the order they are added to the controller.
+    '''
+    if len(devices) == 0:
+        return np.zeros([0, 3], dtype=np.float64)
+    return np.concatenate([device_transducer_positions(pos, q) for pos, q in devices])
+
+
+def fingerprint(positions):
+    '''Hex digest identifying a geometry from its transducer positions (rounded to float32).'''
+    return hashlib.sha1(np.ascontiguousarray(positions, dtype=np.float32).tobytes()).hexdigest()
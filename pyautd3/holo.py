@@ -0,0 +1,162 @@
+'''
+File: holo.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import numpy as np
+
+from .autd import OptMethod, SDPParams, EVDParams
+from .simulator import transfer_matrix
+from . import gain_engine, lut
+
+DEFAULT_REPEAT = 100
+DEFAULT_REGULARIZATION = 1.0
+
+
+def _normalize(x):
+    abs_x = np.abs(x)
+    return np.where(abs_x > 0, x / np.where(abs_x > 0, abs_x, 1.0), 1.0)
+
+
+def _hermite(a):
+    return np.conj(np.swapaxes(a, -1, -2))
+
+
+def naive(g, amps):
+    '''Superposition of single focus solutions. g is (..., M, T), amps is (..., M). Returns (..., T) complex drive.'''
+    return np.einsum('...mt,...m->...t', np.conj(g), amps)
+
+
+def gs(g, amps, repeat: int = DEFAULT_REPEAT, initial=None):
+    '''Gerchberg-Saxton with uniform transducer amplitude. initial is (..., T) phases [rad] to start from.'''
+    q0 = np.ones(g.shape[:-2] + g.shape[-1:], dtype=np.complex128)
+    q = q0 if initial is None else np.exp(1j * np.broadcast_to(initial, q0.shape))
+    for _ in range(repeat):
+        gamma = np.einsum('...mt,...t->...m', g, q)
+        p = amps * _normalize(gamma)
+        xi = np.einsum('...mt,...m->...t', np.conj(g), p)
+        q = q0 * _normalize(xi)
+    return q
+
+
+def gspat(g, amps, repeat: int = DEFAULT_REPEAT, initial=None):
+    '''GS-PAT (Plasencia et al., 2020). initial is (..., T) phases [rad] to start from.'''
+    denominator = np.sum(np.abs(g) ** 2, axis=-1, keepdims=True)
+    b = _hermite(g / denominator)
+    r = g @ b
+    if initial is None:
+        p = amps.astype(np.complex128)
+    else:
+        q = np.exp(1j * np.asarray(initial))
+        p = amps * _normalize(np.einsum('...mt,...t->...m', g, q))
+    for _ in range(repeat):
+        gamma = np.einsum('...ij,...j->...i', r, p)
+        p = amps * _normalize(gamma)
+    gamma = np.einsum('...ij,...j->...i', r, p)
+    abs_gamma = np.abs(gamma)
+    p = _normalize(gamma) * amps * amps / np.where(abs_gamma > 0, abs_gamma, 1.0)
+    return np.einsum('...tm,...m->...t', b, p)
+
+
+def evd(g, amps, regularization: float = DEFAULT_REGULARIZATION):
+    '''Eigenvalue decomposition based method (Long et al., 2014) with Tikhonov regularization.'''
+    m = g.shape[-2]
+    denominator = np.sum(np.abs(g) ** 2, axis=-1, keepdims=True)
+    x = _hermite(g / denominator) * amps[..., np.newaxis, :]
+    r = g @ x
+    eigenvalues, eigenvectors = np.linalg.eig(r)
+    max_idx = np.argmax(np.abs(eigenvalues), axis=-1)
+    e = np.take_along_axis(eigenvectors, max_idx[..., np.newaxis, np.newaxis], axis=-1)[..., 0]
+    f = amps * _normalize(e)
+
+    # least squares of [G; gamma * Sigma] q = [f; 0]. Sigma is diagonal, so the (M, M) push-through form is solved
+    sigma = np.sqrt(np.einsum('...mt,...m->...t', np.abs(g), amps) / m)
+    inv_sigma2 = 1.0 / np.maximum((regularization * sigma) ** 2, 1e-12)
+    a = (g * inv_sigma2[..., np.newaxis, :]) @ _hermite(g) + np.eye(m)
+    y = np.linalg.solve(a, f[..., np.newaxis])[..., 0]
+    return inv_sigma2 * np.einsum('...mt,...m->...t', np.conj(g), y)
+
+
+def to_gain_data(q, normalize_amp: bool = True):
+    '''Convert complex drive (..., T) to packed duty/phase data usable by Gain.custom.
+
+    If normalize_amp, the amplitudes are scaled so that the largest one is 1. Otherwise all transducers are driven
+    at full amplitude and only the phases are used.
+    '''
+    phase_code = lut.phase_to_code(np.angle(q))
+    if normalize_amp:
+        abs_q = np.abs(q)
+        max_q = np.max(abs_q, axis=-1, keepdims=True)
+        amp = abs_q / np.where(max_q > 0, max_q, 1.0)
+    else:
+        amp = np.ones(q.shape)
+    return gain_engine.pack(phase_code, gain_engine.adjust_amp(amp))
+
+
+def _param(value, default):
+    return default if value is None or value < 0 else value
+
+
+def solve(g, amps, method: OptMethod, params=None, initial=None):
+    '''Solve with g of shape (..., M, T) and amps of shape (..., M). Returns the (..., T) complex drive.
+
+    GS and GS_PAT take repeat and EVD takes regularization from params (SDPParams or EVDParams); a negative value
+    selects the default. NLSParams only configures LM, which is not implemented here, so it is never used.
+    Raises ValueError for SDP and LM, which are only available in the native library (see Gain.holo).
+    '''
+    g = np.asarray(g, dtype=np.complex128)
+    amps = np.asarray(amps, dtype=np.float64)
+    if method == OptMethod.NAIVE:
+        return naive(g, amps)
+    if method == OptMethod.GS:
+        return gs(g, amps, _param(getattr(params, 'repeat', None), DEFAULT_REPEAT), initial)
+    if method == OptMethod.GS_PAT:
+        return gspat(g, amps, _param(getattr(params, 'repeat', None), DEFAULT_REPEAT), initial)
+    if method == OptMethod.EVD:
+        return evd(g, amps, _param(getattr(params, 'regularization', None), DEFAULT_REGULARIZATION))
+    raise ValueError(f'{method.name} is only available in the native library')
+
+
+class HoloSolver:
+    '''NumPy implementation of the holo gain optimizations for the geometry of an AUTD controller.
+
+    Supports NAIVE, GS, GS_PAT and EVD (see solve for the params used). Many foci sets of the same size are solved at once by passing foci of shape
+    (B, M, 3) and amps of shape (B, M). With warm_start, GS and GS_PAT start from the phases of the previous result,
+    which keeps moving multi-focus patterns smooth and converges in fewer iterations.
+    '''
+
+    def __init__(self, autd):
+        self.trans_pos = autd.transducer_positions()
+        self.trans_dir = autd.device_directions()[autd.device_index_map()]
+        self.wavelength = autd.wavelength()
+        self._last_phases = None
+
+    def reset(self):
+        self._last_phases = None
+
+    def solve(self, foci, amps, method: OptMethod = OptMethod.GS_PAT, params=None, warm_start: bool = False):
+        '''Returns packed duty/phase data of shape (T,), or (B, T) for batched foci.'''
+        foci = np.asarray(foci, dtype=np.float64)
+        amps = np.asarray(amps, dtype=np.float64)
+        if foci.shape[:-1] != amps.shape:
+            raise ValueError(f'foci of shape {foci.shape} and amps of shape {amps.shape} do not match')
+
+        g = transfer_matrix(self.trans_pos, self.trans_dir, foci, self.wavelength)
+        initial = None
+        if warm_start and self._last_phases is not None:
+            initial = self._last_phases
+            if initial.shape != g.shape[:-2] + g.shape[-1:] and initial.ndim > 1:
+                initial = initial[-1]
+        q = solve(g, amps, method, params, initial)
+        self._last_phases = np.angle(q)
+
+        normalize_amp = True
+        if isinstance(params, (SDPParams, EVDParams)):
+            normalize_amp = bool(params.normalize_amp)
+        return to_gain_data(q, normalize_amp)
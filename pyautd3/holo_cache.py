@@ -0,0 +1,105 @@
+'''
+File: holo_cache.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+from collections import OrderedDict
+import threading
+import numpy as np
+
+from . import geometry
+
+_ENTRY_OVERHEAD = 512
+
+
+class HoloCache:
+    '''LRU cache of holo gains bounded by an estimated memory size.
+
+    Entries are keyed on the foci (quantized to foci_quantum [mm]), the amplitudes (quantized to amp_quantum),
+    the optimization method, the raw contents of the params struct and the geometry of autd.
+    A cached gain keeps the result of the native optimization once it has been sent, so sending the same
+    problem again does not solve it again.
+    '''
+
+    def __init__(self, autd, max_bytes: int = 64 * 1024 * 1024, foci_quantum: float = 0.01, amp_quantum: float = 1e-4):
+        self.autd = autd
+        self.max_bytes = max_bytes
+        self.foci_quantum = foci_quantum
+        self.amp_quantum = amp_quantum
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self._geometry = None
+        self._geometry_digest = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def current_bytes(self):
+        return self._current_bytes
+
+    def _geometry_key(self):
+        positions = self.autd.transducer_positions()
+        if positions is not self._geometry:
+            self._geometry_digest = geometry.fingerprint(positions)
+            self._geometry = positions
+        return self._geometry_digest
+
+    def key(self, foci, amps, method, params):
+        foci = np.round(np.asarray(foci, dtype=np.float64).reshape(-1, 3) / self.foci_quantum).astype(np.int64)
+        amps = np.round(np.asarray(amps, dtype=np.float64).reshape(-1) / self.amp_quantum).astype(np.int64)
+        params = None if params is None else (type(params).__name__, bytes(params))
+        return (foci.tobytes(), amps.tobytes(), int(method), params, self._geometry_key())
+
+    def _entry_size(self, key):
+        return len(key[0]) + len(key[1]) + 2 * self.autd.num_transducers() + _ENTRY_OVERHEAD
+
+    def get(self, key):
+        with self._lock:
+            gain, size = self._entries.get(key, (None, 0))
+            if gain is not None and gain.closed():
+                # closed by its user; a closed gain cannot be sent, so drop it and solve again
+                del self._entries[key]
+                self._current_bytes -= size
+                gain = None
+            if gain is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return gain
+
+    def put(self, key, gain):
+        size = self._entry_size(key)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            # the size is stored with the gain, since it depends on the number of transducers at the time of put
+            self._entries[key] = (gain, size)
+            self._current_bytes += size
+            while self._current_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._current_bytes -= old_size
+
+    def get_or_create(self, foci, amps, method, params, factory):
+        key = self.key(foci, amps, method, params)
+        gain = self.get(key)
+        if gain is None:
+            gain = factory()
+            self.put(key, gain)
+        return gain
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
@@ -0,0 +1,146 @@
+'''
+File: instrumentation.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import threading
+import time
+
+SUB_BUCKET_BITS = 5
+PROMETHEUS_BOUNDS_NS = [1000 * b for b in (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+                                           25000, 50000, 100000, 250000, 500000, 1000000, 2500000, 5000000, 10000000)]
+
+
+def _bucket_index(ns: int):
+    if ns < (1 << SUB_BUCKET_BITS):
+        return ns
+    shift = ns.bit_length() - SUB_BUCKET_BITS
+    return ((shift + 1) << (SUB_BUCKET_BITS - 1)) + (ns >> shift) - (1 << (SUB_BUCKET_BITS - 1))
+
+
+def _bucket_upper_bound(idx: int):
+    if idx < (1 << SUB_BUCKET_BITS):
+        return idx
+    half = 1 << (SUB_BUCKET_BITS - 1)
+    shift = idx // half - 1
+    mantissa = idx % half + half
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    '''HDR-style histogram of latencies in nanoseconds.
+
+    Buckets are linear up to 2^SUB_BUCKET_BITS ns and log-linear above, with 2^(SUB_BUCKET_BITS-1) sub-buckets
+    per power of two, i.e. a relative error of at most about 6%.
+    '''
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = {}
+
+    def record(self, ns: int):
+        ns = max(int(ns), 0)
+        idx = _bucket_index(ns)
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        self.count += 1
+        self.total_ns += ns
+        self.min_ns = ns if self.min_ns is None else min(self.min_ns, ns)
+        self.max_ns = max(self.max_ns, ns)
+
+    def percentile(self, p: float):
+        if self.count == 0:
+            return 0
+        target = max(1, int(round(self.count * p / 100.0)))
+        acc = 0
+        for idx in sorted(self.buckets):
+            acc += self.buckets[idx]
+            if acc >= target:
+                return min(_bucket_upper_bound(idx), self.max_ns)
+        return self.max_ns
+
+    def cumulative_counts(self, bounds_ns):
+        items = sorted((_bucket_upper_bound(idx), c) for idx, c in self.buckets.items())
+        res = []
+        acc = 0
+        i = 0
+        for bound in bounds_ns:
+            while i < len(items) and items[i][0] <= bound:
+                acc += items[i][1]
+                i += 1
+            res.append(acc)
+        return res
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ns': self.total_ns,
+            'mean_ns': self.total_ns / self.count if self.count else 0.0,
+            'min_ns': self.min_ns or 0,
+            'max_ns': self.max_ns,
+            'p50_ns': self.percentile(50),
+            'p90_ns': self.percentile(90),
+            'p99_ns': self.percentile(99),
+            'p999_ns': self.percentile(99.9),
+        }
+
+
+class InstrumentedDLL:
+    '''Proxy of a ctypes library that records a LatencyHistogram for every function called through it.'''
+
+    def __init__(self, dll):
+        self.dll = dll
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        fn = getattr(self.dll, name)
+        with self._lock:
+            hist = self.histograms.setdefault(name, LatencyHistogram())
+        lock = self._lock
+        clock = time.perf_counter
+
+        def wrapper(*args):
+            start = clock()
+            try:
+                return fn(*args)
+            finally:
+                elapsed = int((clock() - start) * 1e9)
+                with lock:
+                    hist.record(elapsed)
+
+        wrapper.__name__ = name
+        # cache the wrapper so that later lookups do not go through __getattr__
+        self.__dict__[name] = wrapper
+        return wrapper
+
+    def reset(self):
+        with self._lock:
+            for hist in self.histograms.values():
+                hist.__init__()
+
+    def to_dict(self):
+        with self._lock:
+            return {name: hist.to_dict() for name, hist in self.histograms.items() if hist.count > 0}
+
+    def to_prometheus(self, prefix: str = 'pyautd3_native'):
+        lines = [f'# HELP {prefix}_call_seconds Latency of native library calls.', f'# TYPE {prefix}_call_seconds histogram']
+        with self._lock:
+            for name in sorted(self.histograms):
+                hist = self.histograms[name]
+                if hist.count == 0:
+                    continue
+                for bound, count in zip(PROMETHEUS_BOUNDS_NS, hist.cumulative_counts(PROMETHEUS_BOUNDS_NS)):
+                    lines.append(f'{prefix}_call_seconds_bucket{{function="{name}",le="{bound / 1e9:g}"}} {count}')
+                lines.append(f'{prefix}_call_seconds_bucket{{function="{name}",le="+Inf"}} {hist.count}')
+                lines.append(f'{prefix}_call_seconds_sum{{function="{name}"}} {hist.total_ns / 1e9:.9f}')
+                lines.append(f'{prefix}_call_seconds_count{{function="{name}"}} {hist.count}')
+        return '\n'.join(lines) + '\n'
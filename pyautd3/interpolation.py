@@ -0,0 +1,147 @@
+'''
+File: interpolation.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import numpy as np
+
+from . import gain_engine, lut
+
+PHASE_PERIOD = float(lut.PHASE_PERIOD)
+
+
+def _keyframe_times(times, num_keyframes, loop):
+    if times is None:
+        return np.arange(num_keyframes + (1 if loop else 0), dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    expected = num_keyframes + (1 if loop else 0)
+    if times.shape != (expected,):
+        raise ValueError(f'times must have shape ({expected},), but got {times.shape}')
+    if np.any(np.diff(times) <= 0):
+        raise ValueError('times must be strictly increasing')
+    return times
+
+
+def _frame_times(times, num_frames, loop):
+    return np.linspace(times[0], times[-1], num_frames, endpoint=not loop)
+
+
+def _coefficients(values, kind, loop):
+    '''Polynomial coefficients (c0, c1, ...) of each segment between consecutive values (K, ...) in the local parameter.'''
+    p1, p2 = values[:-1], values[1:]
+    if kind == 'linear':
+        return [p1, p2 - p1]
+    if kind != 'cubic':
+        raise ValueError(f'unknown interpolation kind: {kind}')
+    # Catmull-Rom; values[-1] repeats values[0] for a loop, otherwise the end tangents are extrapolated.
+    # Unwrapped phases of a loop end whole cycles away from where they started, so the neighbours taken across
+    # the seam are shifted by that offset
+    if loop:
+        off = values[-1:] - values[:1]
+        p0 = np.concatenate([values[-2:-1] - off, values[:-2]])
+        p3 = np.concatenate([values[2:], values[1:2] + off])
+    else:
+        p0 = np.concatenate([2 * values[:1] - values[1:2], values[:-2]])
+        p3 = np.concatenate([values[2:], 2 * values[-1:] - values[-2:-1]])
+    return [p1, 0.5 * (p2 - p0), 0.5 * (2 * p0 - 5 * p1 + 4 * p2 - p3), 0.5 * (3 * p1 - p0 - 3 * p2 + p3)]
+
+
+def _evaluate(values, times, t, kind, loop=False):
+    '''Interpolate values (K, ...) given at times (K,) at t (N,), sorted ascending. Returns (N, ...) float32.'''
+    values = np.asarray(values, dtype=np.float32)
+    coef = _coefficients(values, kind, loop)
+    out = np.empty((len(t),) + values.shape[1:], dtype=np.float32)
+    bounds = np.searchsorted(t, times[1:-1], side='left')
+    starts = np.concatenate([[0], bounds])
+    stops = np.concatenate([bounds, [len(t)]])
+    shape = (-1,) + (1,) * (values.ndim - 1)
+    for k, (start, stop) in enumerate(zip(starts, stops)):
+        if start == stop:
+            continue
+        u = ((t[start:stop] - times[k]) / (times[k + 1] - times[k])).astype(np.float32).reshape(shape)
+        # Horner's scheme, broadcasting the frames of this segment against the coefficients
+        acc = np.broadcast_to(coef[-1][k], out[start:stop].shape).copy()
+        for c in reversed(coef[:-1]):
+            acc *= u
+            acc += c[k]
+        out[start:stop] = acc
+    return out
+
+
+def _pack(phase, duty):
+    '''Round interpolated phase codes and duties and pack them. Phases are wrapped into (0, 255], the range of gain_engine.'''
+    phase = np.round(phase)
+    phase -= PHASE_PERIOD * np.ceil(phase / PHASE_PERIOD - 1.0)
+    duty = np.clip(np.round(duty), 0, 255)
+    return gain_engine.pack(phase.astype(np.uint16), duty.astype(np.uint16))
+
+
+def unwrap_phase(phase, axis: int = 0):
+    '''Unwrap phase codes along axis so that consecutive values differ by less than half a period.'''
+    phase = np.asarray(phase, dtype=np.float32)
+    d = np.diff(phase, axis=axis)
+    d -= PHASE_PERIOD * np.round(d / PHASE_PERIOD)
+    first = np.take(phase, [0], axis=axis)
+    return np.concatenate([first, first + np.cumsum(d, axis=axis)], axis=axis)
+
+
+def interpolate(keyframes, num_frames: int, times=None, kind: str = 'linear', loop: bool = False):
+    '''Generate num_frames gains between keyframe gains by phase-unwrapped interpolation.
+
+    keyframes is a (K, num_transducers) array of packed duty/phase data (see gain_engine), e.g. from
+    HoloSolver.solve or gain_engine. Each transducer phase is unwrapped along the keyframes and interpolated
+    along the shortest way around the cycle, duties are interpolated directly. times gives the time of each keyframe
+    (K + 1 values if loop, the last one for the return to the first keyframe); they are evenly spaced by default.
+    kind is 'linear' or 'cubic' (Catmull-Rom). If loop, the animation returns to the first keyframe and can be
+    repeated seamlessly. Returns a (num_frames, num_transducers) uint16 array for AUTD.append_stm_gains or Gain.custom.
+    '''
+    keyframes = np.asarray(keyframes, dtype=np.uint16)
+    if keyframes.ndim != 2 or len(keyframes) < 2 - int(loop):
+        raise ValueError(f'keyframes must have shape (K, num_transducers) with at least 2 keyframes, but got {keyframes.shape}')
+    if loop:
+        keyframes = np.concatenate([keyframes, keyframes[:1]])
+    times = _keyframe_times(times, len(keyframes) - (1 if loop else 0), loop)
+
+    t = _frame_times(times, num_frames, loop)
+    phase = _evaluate(unwrap_phase(keyframes & 0xFF), times, t, kind, loop)
+    duty = _evaluate(keyframes >> 8, times, t, kind, loop)
+    return _pack(phase, duty)
+
+
+def blend(a, b, weight):
+    '''Blend two gains by phase-unwrapped interpolation. weight is a scalar or (N,), 0 gives a and 1 gives b.
+
+    Returns a (num_transducers,) array for a scalar weight, otherwise (N, num_transducers).
+    '''
+    weight = np.asarray(weight, dtype=np.float32)
+    keyframes = np.stack([np.asarray(a, dtype=np.uint16), np.asarray(b, dtype=np.uint16)])
+    phase = unwrap_phase(keyframes & 0xFF)
+    duty = (keyframes >> 8).astype(np.float32)
+    w = weight.reshape(-1, 1)
+    res = _pack(phase[0] + w * (phase[1] - phase[0]), duty[0] + w * (duty[1] - duty[0]))
+    return res[0] if weight.ndim == 0 else res
+
+
+def interpolate_foci(trans_pos, foci, num_frames: int, wavelength: float, times=None, kind: str = 'linear',
+                     loop: bool = False, amp=1.0):
+    '''Generate num_frames focal point gains along a path through keyframe foci.
+
+    The focal points, not the phases, are interpolated, and each frame is computed exactly with gain_engine.
+    Arguments are as in interpolate; amp is a scalar or one value per keyframe. Returns a (num_frames, num_transducers) uint16 array.
+    '''
+    foci = np.asarray(foci, dtype=np.float64).reshape(-1, 3)
+    amps = np.broadcast_to(np.asarray(amp, dtype=np.float64), (len(foci),))
+    if loop:
+        foci = np.concatenate([foci, foci[:1]])
+        amps = np.concatenate([amps, amps[:1]])
+    times = _keyframe_times(times, len(foci) - (1 if loop else 0), loop)
+    t = _frame_times(times, num_frames, loop)
+    points = _evaluate(foci, times, t, kind, loop)
+    frame_amps = np.clip(_evaluate(amps, times, t, 'linear'), 0.0, 1.0)
+    return gain_engine.focal_point(trans_pos, points, wavelength, frame_amps)
@@ -0,0 +1,80 @@
+'''
+File: lut.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import math
+import threading
+
+import numpy as np
+
+# the firmware has 8-bit duty and phase; phase codes 0 and 255 both mean phase 0
+DUTY_MAX = 255
+PHASE_PERIOD = 255
+
+_DUTY_TO_AMP = np.sin(np.pi * np.arange(DUTY_MAX + 1) / 511.0)
+_CODE_TO_PHASE = 2.0 * np.pi * np.arange(256) / PHASE_PERIOD
+_CODE_TO_COMPLEX = np.exp(1j * _CODE_TO_PHASE)
+
+_packed_to_complex = None
+_lock = threading.Lock()
+
+
+def _packed_table():
+    # 65536 entries (1 MiB), built on first use so that importing pyautd3 stays cheap
+    global _packed_to_complex
+    if _packed_to_complex is None:
+        with _lock:
+            if _packed_to_complex is None:
+                _packed_to_complex = np.outer(_DUTY_TO_AMP, _CODE_TO_COMPLEX).reshape(-1)
+    return _packed_to_complex
+
+
+def amp_to_duty(amp):
+    '''Duty for a normalized amplitude, int(511 asin(amp) / pi), with amp clipped to [0, 1].
+
+    Scalars return an int, arrays of any shape a uint16 array. This direction is evaluated directly:
+    a vectorized arcsin is faster than a table gather indexed by a float in NumPy, and exact at the steps.
+    '''
+    if np.ndim(amp) == 0:
+        return int(511.0 * math.asin(min(max(float(amp), 0.0), 1.0)) / math.pi)
+    amp = np.clip(np.asarray(amp, dtype=np.float64), 0.0, 1.0)
+    return (511.0 / np.pi * np.arcsin(amp)).astype(np.uint16)
+
+
+def duty_to_amp(duty):
+    '''Normalized amplitude emitted with a duty, sin(pi duty / 511).'''
+    return _DUTY_TO_AMP[np.asarray(duty, dtype=np.uint16) & 0xFF]
+
+
+def phase_to_code(phase):
+    '''8-bit phase code of a phase [rad]. Codes run over 0-255 with a period of 255.'''
+    scaled = np.asarray(phase, dtype=np.float64) * (PHASE_PERIOD / (2.0 * math.pi))
+    return np.round(np.mod(scaled, PHASE_PERIOD)).astype(np.uint16)
+
+
+def code_to_phase(code):
+    '''Phase [rad] of an 8-bit phase code.'''
+    return _CODE_TO_PHASE[np.asarray(code, dtype=np.uint16) & 0xFF]
+
+
+def code_to_complex(code):
+    '''exp(i phase) of an 8-bit phase code.'''
+    return _CODE_TO_COMPLEX[np.asarray(code, dtype=np.uint16) & 0xFF]
+
+
+def unpack(data):
+    '''Split packed duty/phase data (see gain_engine.pack) into normalized amplitude and phase [rad].'''
+    data = np.asarray(data, dtype=np.uint16)
+    return _DUTY_TO_AMP[data >> 8], _CODE_TO_PHASE[data & 0xFF]
+
+
+def to_complex(data):
+    '''Complex drive amp exp(i phase) of packed duty/phase data, as one gather from a table of all 65536 values.'''
+    return _packed_table()[np.asarray(data, dtype=np.uint16)]
@@ -0,0 +1,81 @@
+'''
+File: modulation_builder.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import numpy as np
+
+from .autd import Configuration, Modulation
+
+
+class ModulationBuilder:
+    '''Synthesizes modulation waveforms with NumPy.
+
+    Waveforms are float64 arrays of normalized amplitude in [0, 1], sampled at config.mod_sample_freq.
+    Their length defaults to config.mod_buf_size, so integer frequencies loop seamlessly. They can be mixed,
+    resampled and kept around freely. to_bytes converts a waveform to the uint8 buffer of the firmware,
+    and build uploads it through Modulation.custom in one call.
+    '''
+
+    def __init__(self, config: Configuration = None):
+        config = Configuration() if config is None else config
+        self.sample_freq = int(config.mod_sample_freq)
+        self.buf_size = int(config.mod_buf_size)
+
+    def time(self, length: int = None):
+        length = self.buf_size if length is None else length
+        return np.arange(length) / self.sample_freq
+
+    def static(self, amp: float = 1.0, length: int = None):
+        return np.full(self.buf_size if length is None else length, amp, dtype=np.float64)
+
+    def sine(self, freq: float, amp: float = 1.0, offset: float = 0.5, phase: float = 0.0, length: int = None):
+        return amp / 2 * np.sin(2 * np.pi * freq * self.time(length) + phase) + offset
+
+    def square(self, freq: float, low: float = 0.0, high: float = 1.0, duty: float = 0.5, length: int = None):
+        cycle = np.mod(freq * self.time(length), 1.0)
+        return np.where(cycle < duty, high, low).astype(np.float64)
+
+    def saw(self, freq: float, length: int = None):
+        return np.mod(freq * self.time(length), 1.0)
+
+    def resample(self, samples, src_freq: float, length: int = None):
+        '''Linearly resample samples recorded at src_freq to the modulation sampling frequency.
+
+        If length is given, the result is truncated or zero-padded to that length.
+        '''
+        samples = np.asarray(samples, dtype=np.float64)
+        duration = len(samples) / src_freq
+        num = int(round(duration * self.sample_freq)) if length is None else length
+        t = np.arange(num) / self.sample_freq
+        src_t = np.arange(len(samples)) / src_freq
+        return np.interp(t, src_t, samples, right=0.0)
+
+    @staticmethod
+    def mix(*waves, weights=None):
+        '''Weighted sum of waveforms of the same length, clipped to [0, 1].'''
+        waves = np.stack([np.asarray(w, dtype=np.float64) for w in waves])
+        weights = np.full(len(waves), 1.0 / len(waves)) if weights is None else np.asarray(weights, dtype=np.float64)
+        return np.clip(weights @ waves, 0.0, 1.0)
+
+    @staticmethod
+    def multiply(*waves):
+        res = np.ones_like(np.asarray(waves[0], dtype=np.float64))
+        for w in waves:
+            res = res * np.asarray(w, dtype=np.float64)
+        return res
+
+    def to_bytes(self, wave):
+        wave = np.asarray(wave, dtype=np.float64)
+        if len(wave) > self.buf_size:
+            raise ValueError(f'modulation length {len(wave)} exceeds the buffer size {self.buf_size}')
+        return np.round(np.clip(wave, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+    def build(self, wave):
+        return Modulation.custom(self.to_bytes(wave))
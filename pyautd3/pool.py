@@ -0,0 +1,142 @@
+'''
+File: pool.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+from collections import OrderedDict
+import threading
+
+import numpy as np
+
+from .autd import Gain
+
+
+class Arena:
+    '''Owns native objects (Gain, Modulation, Sequence or anything with close()) and frees them together.
+
+    Use it as a context manager to bound the lifetime of the objects created in a scope:
+
+        with Arena() as arena:
+            g = arena.track(Gain.focal_point(p))
+            autd.append_gain_sync(g)
+    '''
+
+    def __init__(self):
+        self._objects = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def track(self, obj):
+        with self._lock:
+            self._objects.append(obj)
+        return obj
+
+    def close(self):
+        with self._lock:
+            objects, self._objects = self._objects, []
+        for obj in objects:
+            obj.close()
+
+
+class GainPool:
+    '''LRU pool of native gains keyed by kind and parameters.
+
+    Requesting a gain with the same parameters again returns the pooled object instead of creating a new native gain.
+    At most max_size gains are kept; the least recently used one is closed when the pool is full.
+    Gains returned by the pool are borrowed: do not close them, and do not use them after they are evicted
+    or after the pool is closed. autd3capi cannot update a native gain in place, so a gain with new parameters
+    is always a new native object.
+    '''
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._gains = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self._gains)
+
+    def get_or_create(self, key, factory):
+        with self._lock:
+            gain = self._gains.get(key)
+            if gain is not None and gain.closed():
+                # closed although borrowed; drop it and create a new one
+                del self._gains[key]
+                gain = None
+            if gain is not None:
+                self._gains.move_to_end(key)
+                self.hits += 1
+                return gain
+            self.misses += 1
+        gain = factory()
+        evicted = []
+        with self._lock:
+            if key in self._gains:
+                # created concurrently by another thread
+                evicted.append(gain)
+                gain = self._gains[key]
+            else:
+                self._gains[key] = gain
+                while len(self._gains) > self.max_size:
+                    evicted.append(self._gains.popitem(last=False)[1])
+                    self.evictions += 1
+        for g in evicted:
+            g.close()
+        return gain
+
+    def focal_point(self, pos, amp: float = 1.0):
+        return self.focal_point_with_duty(pos, Gain.adjust_amp(amp))
+
+    def focal_point_with_duty(self, pos, duty: int = 255):
+        key = ('focal_point', tuple(float(p) for p in pos), int(duty))
+        return self.get_or_create(key, lambda: Gain.focal_point_with_duty(pos, duty))
+
+    def plane_wave(self, dir, amp: float = 1.0):
+        return self.plane_wave_with_duty(dir, Gain.adjust_amp(amp))
+
+    def plane_wave_with_duty(self, dir, duty: int = 255):
+        key = ('plane_wave', tuple(float(d) for d in dir), int(duty))
+        return self.get_or_create(key, lambda: Gain.plane_wave_with_duty(dir, duty))
+
+    def bessel_beam(self, pos, dir, theta_z, amp: float = 1.0):
+        return self.bessel_beam_with_duty(pos, dir, theta_z, Gain.adjust_amp(amp))
+
+    def bessel_beam_with_duty(self, pos, dir, theta_z, duty: int = 255):
+        key = ('bessel_beam', tuple(float(p) for p in pos), tuple(float(d) for d in dir), float(theta_z), int(duty))
+        return self.get_or_create(key, lambda: Gain.bessel_beam_with_duty(pos, dir, theta_z, duty))
+
+    def custom(self, data):
+        data = np.ascontiguousarray(data, dtype=np.uint16)
+        return self.get_or_create(('custom', data.tobytes()), lambda: Gain.custom(data))
+
+    def clear(self):
+        with self._lock:
+            gains, self._gains = list(self._gains.values()), OrderedDict()
+        for g in gains:
+            g.close()
+
+    def close(self):
+        self.clear()
@@ -0,0 +1,142 @@
+'''
+File: profile.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+from collections import namedtuple
+import os
+import struct
+
+import numpy as np
+
+from .autd import AUTD, Configuration, ModBufSize, ModSamplingFreq
+from .store import DirectoryStore
+
+MAGIC = b'AUTDPRF\0'
+FORMAT_VERSION = 1
+EXT = '.autdprof'
+
+# magic, version, flags, mod_sample_freq, mod_buf_size, wavelength, num_devices, num_delays
+_HEADER = struct.Struct('<8sHHIIfII')
+_DEVICE = np.dtype([('pos', '<f8', (3,)), ('q', '<f8', (4,)), ('group_id', '<i4')])
+
+_HAS_CONFIG = 1
+_HAS_DELAYS = 2
+_SILENT = 4
+
+
+class Profile(namedtuple('Profile', ['config', 'wavelength', 'silent', 'positions', 'rotations', 'group_ids', 'delays'])):
+    '''Settings of a rig.
+
+    config is the Configuration passed to calibrate, or None. positions (num_devices, 3), rotations (num_devices, 4,
+    as (w, x, y, z)) and group_ids (num_devices,) describe the geometry. delays is a uint16 array, or None.
+    '''
+    __slots__ = ()
+
+    @staticmethod
+    def from_autd(autd: AUTD):
+        positions, rotations = autd.device_poses()
+        return Profile(autd.last_configuration(), autd.wavelength(), bool(autd.is_silent()),
+                       positions, rotations, autd.device_group_ids(), autd.last_delays())
+
+    def matches(self, autd: AUTD, atol: float = 1e-3):
+        '''Whether autd has the same devices at the same poses (within atol [mm] and atol in quaternion components).'''
+        positions, rotations = autd.device_poses()
+        if positions.shape != self.positions.shape:
+            return False
+        # q and -q are the same rotation
+        same_rot = np.minimum(np.abs(rotations - self.rotations).max(axis=1, initial=0.0),
+                              np.abs(rotations + self.rotations).max(axis=1, initial=0.0))
+        return (np.allclose(positions, self.positions, rtol=0.0, atol=atol) and bool(np.all(same_rot <= atol))
+                and np.array_equal(autd.device_group_ids(), self.group_ids))
+
+    def to_bytes(self):
+        flags = ((_HAS_CONFIG if self.config is not None else 0) | (_HAS_DELAYS if self.delays is not None else 0)
+                 | (_SILENT if self.silent else 0))
+        devices = np.zeros(len(self.positions), dtype=_DEVICE)
+        devices['pos'] = self.positions
+        devices['q'] = self.rotations
+        devices['group_id'] = self.group_ids
+        delays = np.zeros(0, dtype='<u2') if self.delays is None else np.ascontiguousarray(self.delays, dtype='<u2')
+        config = self.config if self.config is not None else Configuration()
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, flags, int(config.mod_sample_freq), int(config.mod_buf_size),
+                              self.wavelength, len(devices), delays.size)
+        return header + devices.tobytes() + delays.tobytes()
+
+    @staticmethod
+    def from_bytes(buf):
+        buf = memoryview(buf)
+        magic, version, flags, freq, buf_size, wavelength, num_devices, num_delays = _HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError('not a pyautd3 profile')
+        if version > FORMAT_VERSION:
+            raise ValueError(f'profile format version {version} is newer than the supported version {FORMAT_VERSION}')
+        devices = np.frombuffer(buf, dtype=_DEVICE, count=num_devices, offset=_HEADER.size)
+        delays = np.frombuffer(buf, dtype='<u2', count=num_delays, offset=_HEADER.size + devices.nbytes)
+        config = None
+        if flags & _HAS_CONFIG:
+            config = Configuration()
+            config.mod_sample_freq = ModSamplingFreq(freq)
+            config.mod_buf_size = ModBufSize(buf_size)
+        return Profile(config, wavelength, bool(flags & _SILENT), devices['pos'], devices['q'], devices['group_id'],
+                       delays if flags & _HAS_DELAYS else None)
+
+    def apply(self, autd: AUTD, link=None, atol: float = 1e-3):
+        '''Bring up autd with this profile and return the result of calibrate (None if no configuration is stored).
+
+        If autd has no devices, the stored geometry is added; otherwise it must match (see matches), or ValueError is
+        raised. If link is given, it is opened after the geometry is set up. Then the wavelength, silent mode, delays and
+        calibration are reapplied back to back, without recomputing anything.
+        '''
+        if autd.num_devices() == 0:
+            for pos, q, group_id in zip(self.positions, self.rotations, self.group_ids):
+                autd.add_device_quaternion(pos, q, int(group_id))
+        elif not self.matches(autd, atol):
+            raise ValueError('the geometry of the controller differs from the profile')
+        if link is not None:
+            autd.open_with(link)
+        autd.set_wavelength(self.wavelength)
+        autd.set_silent(self.silent)
+        if self.delays is not None:
+            autd.set_delay(self.delays)
+        return autd.calibrate(self.config) if self.config is not None else None
+
+
+class ProfileStore(DirectoryStore):
+    '''Directory of rig profiles in a compact binary format, one file per profile.
+
+    A file is a fixed header (configuration, wavelength, flags and counts), followed by the device poses and the
+    raw uint16 delay table, so loading is one read without parsing.
+    '''
+
+    EXT = EXT
+
+    def save(self, name, autd_or_profile):
+        '''Save a Profile, or the current settings of an AUTD (see Profile.from_autd). Returns the saved Profile.'''
+        profile = Profile.from_autd(autd_or_profile) if isinstance(autd_or_profile, AUTD) else autd_or_profile
+        tmp = self._file(name) + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(profile.to_bytes())
+        os.replace(tmp, self._file(name))
+        return profile
+
+    def load(self, name):
+        with open(self._file(name), 'rb') as f:
+            return Profile.from_bytes(f.read())
+
+    def find(self, autd: AUTD, atol: float = 1e-3):
+        '''Name of a stored profile matching the geometry of autd, or None.'''
+        for name in self.names():
+            if self.load(name).matches(autd, atol):
+                return name
+        return None
+
+    def apply(self, name, autd: AUTD, link=None, atol: float = 1e-3):
+        '''Load a profile and apply it to autd (see Profile.apply).'''
+        return self.load(name).apply(autd, link, atol)
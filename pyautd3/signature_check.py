@@ -0,0 +1,60 @@
+'''
+File: signature_check.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import ast
+import glob
+import os
+import sys
+
+from .nativemethods import SIGNATURES
+
+
+def _native_calls(tree):
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Attribute):
+            continue
+        owner = node.func.value
+        if isinstance(owner, ast.Attribute) and owner.attr == 'dll' and node.func.attr.startswith('AUTD'):
+            yield node
+
+
+def check(paths=None):
+    '''Check every native call in paths (the pyautd3 sources by default) against SIGNATURES.
+
+    Reports calls of functions missing from the table and calls whose number of arguments differs from argtypes.
+    Returns a list of problems as strings; an empty list means all call sites match.
+    '''
+    if paths is None:
+        paths = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '*.py')))
+    problems = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for call in _native_calls(tree):
+            name = call.func.attr
+            where = f'{os.path.relpath(path)}:{call.lineno}'
+            if name not in SIGNATURES:
+                problems.append(f'{where}: {name} is not in the signature table')
+                continue
+            if any(isinstance(a, ast.Starred) for a in call.args) or call.keywords:
+                continue
+            expected = len(SIGNATURES[name][0])
+            if len(call.args) != expected:
+                problems.append(f'{where}: {name} is called with {len(call.args)} arguments, but declared with {expected}')
+    return problems
+
+
+if __name__ == '__main__':
+    problems = check(sys.argv[1:] or None)
+    for p in problems:
+        print(p)
+    print(f'{len(problems)} problem(s) found')
+    sys.exit(1 if problems else 0)
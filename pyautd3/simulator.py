@@ -0,0 +1,140 @@
+'''
+File: simulator.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from . import lut
+
+DEFAULT_MAX_CHUNK_BYTES = 64 * 1024 * 1024
+
+_DIR_COEF_A = np.array([1.0, 1.0, 1.0, 0.891250938, 0.707945784, 0.501187234, 0.354813389, 0.251188643, 0.199526231])
+_DIR_COEF_B = np.array([0., 0., -0.00459648054721, -0.0155520765675, -0.0208114779827,
+                        -0.0182211227016, -0.0122437497109, -0.00780345575475, -0.00312857467007])
+_DIR_COEF_C = np.array([0., 0., -0.000787968093807, -0.000307591508224, -0.000218348633296,
+                        0.00047738416141, 0.000120353137658, 0.000323676257958, 0.000143850511])
+_DIR_COEF_D = np.array([0., 0., 1.60125528528e-05, 2.9747624976e-06, 2.31910931569e-05,
+                        -1.1901034125e-05, 6.0239812257e-06, -1.00897423041e-05, -4.85727009098e-06])
+
+
+def directivity_t4010a1(theta_deg):
+    '''Directivity of the T4010A1 transducer, vectorized over theta_deg.'''
+    theta = np.abs(np.asarray(theta_deg, dtype=np.float64))
+    theta = np.where(theta > 90.0, np.abs(180.0 - theta), theta)
+    i = np.clip(np.ceil(theta / 10.0).astype(np.int64), 0, len(_DIR_COEF_A))
+    idx = np.maximum(i - 1, 0)
+    x = theta - idx * 10.0
+    res = _DIR_COEF_A[idx] + _DIR_COEF_B[idx] * x + _DIR_COEF_C[idx] * x * x + _DIR_COEF_D[idx] * x * x * x
+    return np.where(i == 0, 1.0, res)
+
+
+def unpack(data):
+    '''Split packed duty/phase data (see gain_engine.pack) into amplitude and phase [rad].'''
+    return lut.unpack(data)
+
+
+_DIRECTIVITY_LUT_SIZE = 8192
+_DIRECTIVITY_LUT = directivity_t4010a1(np.degrees(np.arccos(np.linspace(-1.0, 1.0, _DIRECTIVITY_LUT_SIZE + 1)))).astype(np.float32)
+
+
+def _field_chunk(grid, trans_pos, trans_dir, trans_sq, trans_dot_dir, q, k, attenuation):
+    # |g - t|^2 and (g - t).n are expanded so that the heavy part is a matrix product,
+    # and the element-wise part runs in float32, which is accurate to far below a wavelength here
+    r2 = np.einsum('ij,ij->i', grid, grid)[:, np.newaxis] - 2.0 * (grid @ trans_pos.T) + trans_sq[np.newaxis, :]
+    r = np.sqrt(np.maximum(r2, 1e-18).astype(np.float32))
+    cos_theta = ((grid @ trans_dir.T) - trans_dot_dir[np.newaxis, :]).astype(np.float32) / r
+    lut_idx = np.rint((np.clip(cos_theta, -1.0, 1.0) + 1.0) * (_DIRECTIVITY_LUT_SIZE / 2)).astype(np.intp)
+    p = _DIRECTIVITY_LUT[lut_idx] / r
+    if attenuation != 0.0:
+        p *= np.exp(np.float32(-attenuation) * r)
+    kr = np.float32(k) * r
+    pc = p * np.cos(kr)
+    ps = p * np.sin(kr)
+    q_re = q.real.astype(np.float32)
+    q_im = q.imag.astype(np.float32)
+    return (pc @ q_re - ps @ q_im) + 1j * (pc @ q_im + ps @ q_re)
+
+
+def transfer_matrix(trans_pos, trans_dir, points, wavelength: float, attenuation: float = 0.0):
+    '''Complex transfer matrix from each transducer to each point, shape points.shape[:-1] + (num_transducers,).'''
+    trans_pos = np.asarray(trans_pos, dtype=np.float64).reshape(-1, 3)
+    trans_dir = np.asarray(trans_dir, dtype=np.float64).reshape(-1, 3)
+    points = np.asarray(points, dtype=np.float64)
+    r_vec = points[..., np.newaxis, :] - trans_pos
+    r = np.maximum(np.linalg.norm(r_vec, axis=-1), 1e-9)
+    cos_theta = np.einsum('...jk,jk->...j', r_vec, trans_dir) / r
+    d = directivity_t4010a1(np.degrees(np.arccos(np.clip(cos_theta, -1.0, 1.0))))
+    return d * np.exp((2.0j * np.pi / wavelength - attenuation) * r) / r
+
+
+def calc_field(trans_pos, trans_dir, data, wavelength: float, grid, attenuation: float = 0.0,
+               chunk_size: int = None, num_workers: int = None):
+    '''Complex sound pressure (arbitrary unit) at each point of grid.
+
+    trans_pos and trans_dir are (num_transducers, 3) arrays, data is the packed duty/phase data of a gain
+    and grid is any array of shape (..., 3). The grid is processed in chunks so that the memory used for
+    intermediate values stays bounded, and the chunks are distributed over num_workers threads if given.
+    Returns an array of shape grid.shape[:-1].
+    '''
+    trans_pos = np.asarray(trans_pos, dtype=np.float64).reshape(-1, 3)
+    trans_dir = np.asarray(trans_dir, dtype=np.float64).reshape(-1, 3)
+    grid = np.asarray(grid, dtype=np.float64)
+    out_shape = grid.shape[:-1]
+    grid = grid.reshape(-1, 3)
+
+    q = lut.to_complex(data)
+    if q.shape != (len(trans_pos),):
+        raise ValueError(f'data must have {len(trans_pos)} elements, but got {q.shape}')
+    k = 2.0 * np.pi / wavelength
+    trans_sq = np.einsum('ij,ij->i', trans_pos, trans_pos)
+    trans_dot_dir = np.einsum('ij,ij->i', trans_pos, trans_dir)
+
+    if chunk_size is None:
+        # a handful of float64/float32 temporaries of shape (chunk_size, num_transducers)
+        chunk_size = max(1, DEFAULT_MAX_CHUNK_BYTES // (64 * max(1, len(trans_pos))))
+
+    res = np.empty(len(grid), dtype=np.complex128)
+
+    def run(start):
+        end = min(start + chunk_size, len(grid))
+        res[start:end] = _field_chunk(grid[start:end], trans_pos, trans_dir, trans_sq, trans_dot_dir, q, k, attenuation)
+
+    starts = range(0, len(grid), chunk_size)
+    if num_workers is None or num_workers <= 1:
+        for start in starts:
+            run(start)
+    else:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            list(executor.map(run, starts))
+
+    return res.reshape(out_shape)
+
+
+class Simulator:
+    '''Computes sound fields for the devices added to an AUTD controller.'''
+
+    def __init__(self, autd, attenuation: float = 0.0):
+        self.trans_pos = autd.transducer_positions()
+        self.trans_dir = autd.device_directions()[autd.device_index_map()]
+        self.wavelength = autd.wavelength()
+        self.attenuation = attenuation
+
+    def field(self, data, grid, chunk_size: int = None, num_workers: int = None):
+        return calc_field(self.trans_pos, self.trans_dir, data, self.wavelength, grid, self.attenuation, chunk_size, num_workers)
+
+    def pressure(self, data, grid, chunk_size: int = None, num_workers: int = None):
+        return np.abs(self.field(data, grid, chunk_size, num_workers))
+
+    @staticmethod
+    def grid(x_range, y_range, z_range):
+        '''Regular grid from (start, stop, num) ranges, shape (nx, ny, nz, 3).'''
+        axes = [np.linspace(*r) for r in (x_range, y_range, z_range)]
+        return np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1)
@@ -0,0 +1,117 @@
+'''
+File: stm_library.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+from collections import namedtuple
+
+import numpy as np
+
+from . import geometry
+from .autd import Sequence
+from .store import DirectoryStore
+
+FORMAT_VERSION = 1
+EXT = '.npz'
+
+SEQUENCE = 'sequence'
+STM = 'stm'
+
+
+class Pattern(namedtuple('Pattern', ['name', 'kind', 'data', 'freq', 'sampling_freq_div', 'geometry'])):
+    '''A stored pattern.
+
+    kind is SEQUENCE for hardware-STM focal points (data is float32 (N, 3)) or STM for software-STM gain tables
+    (data is packed duty/phase uint16 (N, num_transducers)). freq is the playback frequency [Hz], or None.
+    sampling_freq_div is the division reported by Sequence.sampling_frequency_div when the pattern was stored, or 0.
+    It is informational only: autd3capi derives the division from the frequency, so it is not applied when loading.
+    geometry is the fingerprint of the geometry a gain table was computed for, or an empty string.
+    '''
+    __slots__ = ()
+
+
+class STMLibrary(DirectoryStore):
+    '''Directory of precomputed STM patterns, one uncompressed .npz file per pattern.
+
+    Patterns are stored once and pushed to the controller in bulk on later runs, so loading them costs a file read and
+    a single Sequence.add_points or AUTD.append_stm_gains call instead of recomputing every point.
+    '''
+
+    EXT = EXT
+
+    def _save(self, name, kind, data, freq, sampling_freq_div, geometry_fingerprint):
+        np.savez(self._file(name),
+                 version=np.uint32(FORMAT_VERSION),
+                 kind=np.array(kind),
+                 data=data,
+                 freq=np.float64(np.nan if freq is None else freq),
+                 sampling_freq_div=np.uint32(sampling_freq_div),
+                 geometry=np.array(geometry_fingerprint))
+
+    def save_sequence(self, name, points, freq: float = None, seq: Sequence = None):
+        '''Store focal points of a hardware-STM sequence.
+
+        If seq is given, its frequency and sampling frequency division are stored as well.
+        '''
+        points = np.ascontiguousarray(points, dtype=np.float32).reshape(-1, 3)
+        sampling_freq_div = 0
+        if seq is not None:
+            freq = seq.frequency() if freq is None else freq
+            sampling_freq_div = seq.sampling_frequency_div()
+        self._save(name, SEQUENCE, points, freq, sampling_freq_div, '')
+
+    def save_stm(self, name, table, freq: float = None, autd=None):
+        '''Store packed duty/phase data of a software-STM. If autd is given, the table is tied to its geometry.'''
+        table = np.ascontiguousarray(table, dtype=np.uint16)
+        if table.ndim != 2:
+            raise ValueError(f'gain data must have shape (N, num_transducers), but got {table.shape}')
+        fp = geometry.fingerprint(autd.transducer_positions()) if autd is not None else ''
+        self._save(name, STM, table, freq, 0, fp)
+
+    def load(self, name):
+        with np.load(self._file(name)) as f:
+            version = int(f['version'])
+            if version > FORMAT_VERSION:
+                raise ValueError(f'{name} has format version {version}, but only up to {FORMAT_VERSION} is supported')
+            freq = float(f['freq'])
+            return Pattern(name, str(f['kind']), f['data'], None if np.isnan(freq) else freq,
+                           int(f['sampling_freq_div']), str(f['geometry']))
+
+    def sequence(self, name):
+        '''Build a Sequence from a stored pattern and set its stored frequency.'''
+        return self._to_sequence(self.load(name))
+
+    @staticmethod
+    def _to_sequence(pattern):
+        if pattern.kind != SEQUENCE:
+            raise ValueError(f'{pattern.name} is not a sequence pattern')
+        seq = Sequence.sequence()
+        seq.add_points(pattern.data)
+        if pattern.freq is not None:
+            seq.set_frequency(pattern.freq)
+        return seq
+
+    def upload(self, autd, name, start: bool = True):
+        '''Push a stored pattern to autd.
+
+        A sequence pattern is appended with append_sequence and returned. A gain table is appended with
+        append_stm_gains and, if start and a frequency is stored, started with start_stm.
+        Raises ValueError if the table was stored for a different geometry.
+        '''
+        pattern = self.load(name)
+        if pattern.kind == SEQUENCE:
+            seq = self._to_sequence(pattern)
+            autd.append_sequence(seq)
+            return seq
+        if pattern.geometry and pattern.geometry != geometry.fingerprint(autd.transducer_positions()):
+            raise ValueError(f'{name} was computed for a different geometry')
+        autd.append_stm_gains(pattern.data)
+        if start and pattern.freq is not None:
+            autd.start_stm(pattern.freq)
+        return None
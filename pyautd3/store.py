@@ -0,0 +1,35 @@
+'''
+File: store.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import glob
+import os
+
+
+class DirectoryStore:
+    '''Directory with one file per named entry. Subclasses set EXT, the extension of the entry files.'''
+
+    EXT = ''
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, name):
+        return os.path.join(self.path, name + self.EXT)
+
+    def names(self):
+        return sorted(os.path.splitext(os.path.basename(f))[0] for f in glob.glob(os.path.join(self.path, '*' + self.EXT)))
+
+    def __contains__(self, name):
+        return os.path.isfile(self._file(name))
+
+    def remove(self, name):
+        os.remove(self._file(name))
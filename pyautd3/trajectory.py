@@ -0,0 +1,200 @@
+'''
+File: trajectory.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+import math
+
+import numpy as np
+
+from .autd import Sequence
+
+POINT_SEQ_BASE_FREQ = 40000
+POINT_SEQ_BUFFER_SIZE_MAX = 40000
+
+# samples of the arc-length table used to reparametrize curves; points are evaluated on the curve itself
+_ARC_SAMPLES = 16384
+
+
+def _as_points(points):
+    return np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+
+def _plane_basis(normal):
+    '''Two orthonormal vectors spanning the plane perpendicular to normal.'''
+    n = np.asarray(normal, dtype=np.float64)
+    n = n / np.linalg.norm(n)
+    helper = np.array([1.0, 0.0, 0.0]) if abs(n[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    u = np.cross(n, helper)
+    u /= np.linalg.norm(u)
+    return u, np.cross(n, u)
+
+
+def _in_plane(center, normal, x, y):
+    u, v = _plane_basis(normal)
+    return (np.asarray(center, dtype=np.float64) + x[:, None] * u + y[:, None] * v).astype(np.float32)
+
+
+def arc_length(points, closed: bool = False):
+    '''Cumulative arc length at each point, starting at 0. If closed, the closing segment is included at the end.'''
+    points = _as_points(points)
+    if closed:
+        points = np.concatenate([points, points[:1]])
+    d = np.diff(points, axis=0)
+    seg = np.sqrt(np.einsum('ij,ij->i', d, d))
+    return np.concatenate([[0.0], np.cumsum(seg)])
+
+
+def resample(points, num: int, closed: bool = False):
+    '''Resample a polyline to num points equally spaced along its arc length.
+
+    If closed, the polyline is treated as a loop and the last point is one step before the first.
+    '''
+    points = _as_points(points)
+    if closed:
+        points = np.concatenate([points, points[:1]])
+    s = arc_length(points)
+    if s[-1] == 0.0:
+        return np.repeat(points[:1], num, axis=0).astype(np.float32)
+    t = np.linspace(0.0, s[-1], num, endpoint=not closed)
+    return np.stack([np.interp(t, s, points[:, i]) for i in range(3)], axis=1).astype(np.float32)
+
+
+def line(start, end, num: int):
+    return np.linspace(np.asarray(start, dtype=np.float64), np.asarray(end, dtype=np.float64), num).astype(np.float32)
+
+
+def polyline(vertices, num: int, closed: bool = False):
+    return resample(vertices, num, closed)
+
+
+def _uniform_speed(curve, num: int, closed: bool = False, samples: int = _ARC_SAMPLES):
+    '''Evaluate curve(t), t in [0, 1], at num parameters equally spaced along its arc length.'''
+    t_dense = np.linspace(0.0, 1.0, min(max(num, 2) * 4, samples) + 1)
+    s = arc_length(curve(t_dense))
+    target = np.linspace(0.0, s[-1], num, endpoint=not closed)
+    return curve(np.interp(target, s, t_dense)).astype(np.float32)
+
+
+def bezier(control_points, num: int):
+    '''Bézier curve of any degree, sampled at num points equally spaced along its arc length.'''
+    ctrl = _as_points(control_points)
+    degree = len(ctrl) - 1
+    k = np.arange(degree + 1)
+    binom = np.array([math.factorial(degree) // (math.factorial(i) * math.factorial(degree - i)) for i in k], dtype=np.float64)
+
+    def curve(t):
+        return (binom * t[:, None] ** k * (1.0 - t[:, None]) ** (degree - k)) @ ctrl
+
+    return _uniform_speed(curve, num)
+
+
+def spline(points, num: int, closed: bool = False):
+    '''Centripetal Catmull-Rom spline through points, sampled at num points equally spaced along its arc length.'''
+    p = _as_points(points)
+    if closed:
+        ext = np.concatenate([p[-1:], p, p[:2]])
+    else:
+        ext = np.concatenate([2 * p[:1] - p[1:2], p, 2 * p[-1:] - p[-2:-1]])
+    p0, p1, p2, p3 = ext[:-3], ext[1:-2], ext[2:-1], ext[3:]
+
+    def knot(a, b):
+        return np.maximum(np.sqrt(np.linalg.norm(b - a, axis=1)), 1e-9)
+
+    t1 = knot(p0, p1)
+    t2 = t1 + knot(p1, p2)
+    t3 = t2 + knot(p2, p3)
+    num_segments = len(p1)
+
+    def curve(u):
+        # u in [0, 1] covers all segments; split it into a segment index and a local parameter
+        x = u * num_segments
+        i = np.minimum(x.astype(np.int64), num_segments - 1)
+        x = (x - i)[:, None]
+        a, b, c = t1[i][:, None], t2[i][:, None], t3[i][:, None]
+        t = a + (b - a) * x
+        q0, q1, q2, q3 = p0[i], p1[i], p2[i], p3[i]
+        a1 = (a - t) / a * q0 + t / a * q1
+        a2 = (b - t) / (b - a) * q1 + (t - a) / (b - a) * q2
+        a3 = (c - t) / (c - b) * q2 + (t - b) / (c - b) * q3
+        b1 = (b - t) / b * a1 + t / b * a2
+        b2 = (c - t) / (c - a) * a2 + (t - a) / (c - a) * a3
+        return (b - t) / (b - a) * b1 + (t - a) / (b - a) * b2
+
+    return _uniform_speed(curve, num, closed, max(_ARC_SAMPLES, 64 * num_segments))
+
+
+def circle(center, normal, radius: float, num: int):
+    theta = np.linspace(0.0, 2.0 * np.pi, num, endpoint=False)
+    return _in_plane(center, normal, radius * np.cos(theta), radius * np.sin(theta))
+
+
+def lissajous(center, normal, amp_x: float, amp_y: float, freq_x: int, freq_y: int, num: int, phase: float = np.pi / 2):
+    '''Lissajous figure x = amp_x sin(freq_x t + phase), y = amp_y sin(freq_y t) over one period, in the plane perpendicular to normal.'''
+    t = np.linspace(0.0, 2.0 * np.pi, num, endpoint=False)
+    return _in_plane(center, normal, amp_x * np.sin(freq_x * t + phase), amp_y * np.sin(freq_y * t))
+
+
+def spiral(center, normal, r_start: float, r_end: float, turns: float, num: int, uniform_speed: bool = True):
+    '''Archimedean spiral from radius r_start to r_end. If uniform_speed, the points are equally spaced along the path.'''
+    u, v = _plane_basis(normal)
+    center = np.asarray(center, dtype=np.float64)
+
+    def curve(t):
+        theta = 2.0 * np.pi * turns * t
+        r = r_start + (r_end - r_start) * t
+        return center + (r * np.cos(theta))[:, None] * u + (r * np.sin(theta))[:, None] * v
+
+    if uniform_speed:
+        return _uniform_speed(curve, num)
+    return curve(np.linspace(0.0, 1.0, num)).astype(np.float32)
+
+
+def raster(center, normal, width: float, height: float, lines: int, num: int, serpentine: bool = True):
+    '''Raster scan of a width x height rectangle with lines scan lines, resampled to num points along the path.
+
+    If serpentine, every other line is scanned backwards so the path has no fly-back jumps.
+    '''
+    y = np.linspace(-height / 2, height / 2, lines)
+    x = np.tile([-width / 2, width / 2], (lines, 1))
+    if serpentine:
+        x[1::2] = x[1::2, ::-1]
+    vertices = _in_plane(center, normal, x.ravel(), np.repeat(y, 2))
+    return resample(vertices, num)
+
+
+def fit_frequency(points, freq: float, closed: bool = True):
+    '''Resample points so that a Sequence plays them at freq as exactly as the hardware allows.
+
+    A Sequence of N points runs at POINT_SEQ_BASE_FREQ / (div * N), where Sequence.set_frequency truncates
+    POINT_SEQ_BASE_FREQ / (N * freq) to the integer division div. This picks the smallest div for which N does not
+    exceed len(points), then the largest N with N * freq <= POINT_SEQ_BASE_FREQ / div, so that set_frequency(freq)
+    keeps that division. Returns (resampled points, frequency set_frequency(freq) will actually produce).
+    '''
+    points = _as_points(points)
+    ticks = POINT_SEQ_BASE_FREQ / freq
+    n_max = min(len(points), POINT_SEQ_BUFFER_SIZE_MAX, int(ticks))
+    if n_max < 1:
+        raise ValueError(f'{freq} Hz is above the maximum sequence frequency {POINT_SEQ_BASE_FREQ} Hz')
+    # smallest division for which floor(ticks / div) <= n_max
+    div = math.floor(ticks / (n_max + 1)) + 1
+    n = max(1, min(n_max, math.floor(ticks / div)))
+    resampled = resample(points, n, closed) if n != len(points) else points.astype(np.float32)
+    # the division as set_frequency computes it
+    div = max(1, int(POINT_SEQ_BASE_FREQ / (n * freq)))
+    return resampled, POINT_SEQ_BASE_FREQ / (div * n)
+
+
+def to_sequence(points, freq: float = None):
+    '''Upload points to a new Sequence in one call and set its frequency if given.'''
+    seq = Sequence.sequence()
+    seq.add_points(points)
+    if freq is not None:
+        seq.set_frequency(freq)
+    return seq
@@ -0,0 +1,202 @@
+'''
+File: wav_loader.py
+Project: pyautd
+Created Date: 18/10/2026
+-----
+Last Modified: 18/10/2026
+-----
+Copyright (c) 2020 Hapis Lab. All rights reserved.
+
+'''
+
+from collections import OrderedDict
+import mmap
+import os
+import struct
+import threading
+import numpy as np
+
+from .autd import Configuration, Modulation
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class PCMSource:
+    '''Memory-mapped PCM samples. Samples are decoded only when read.'''
+
+    def __init__(self, path, sample_rate: float, dtype, channels: int = 1, data_offset: int = 0, data_size: int = None):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.dtype = np.dtype(dtype)
+        self.channels = channels
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size > 0 else b''
+        data_size = size - data_offset if data_size is None else min(data_size, size - data_offset)
+        frame_bytes = self.dtype.itemsize * channels
+        self.num_frames = data_size // frame_bytes
+        self._samples = np.frombuffer(self._mmap, dtype=self.dtype, count=self.num_frames * channels, offset=data_offset)
+        self._samples = self._samples.reshape(-1, channels)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._samples = None
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        self._file.close()
+
+    @property
+    def duration(self):
+        return self.num_frames / self.sample_rate
+
+    def read(self, start: int, stop: int):
+        '''Frames [start, stop) mixed down to mono and normalized to [0, 1].'''
+        frames = self._samples[max(start, 0):min(stop, self.num_frames)]
+        if self.dtype.kind == 'f':
+            x = (frames.astype(np.float64) + 1.0) / 2.0
+        elif self.dtype.kind == 'u':
+            x = frames.astype(np.float64) / np.iinfo(self.dtype).max
+        else:
+            info = np.iinfo(self.dtype)
+            x = (frames.astype(np.float64) - info.min) / (info.max - info.min)
+        return np.clip(x.mean(axis=1), 0.0, 1.0)
+
+
+def open_raw_pcm(path, sampling_freq: float, dtype=np.uint8):
+    return PCMSource(path, sampling_freq, dtype)
+
+
+def open_wav(path):
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[0:4] != b'RIFF' or header[8:12] != b'WAVE':
+            raise ValueError(f'{path} is not a RIFF/WAVE file')
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f'{path} has no data chunk')
+            chunk_id, chunk_size = struct.unpack('<4sI', chunk)
+            if chunk_id == b'fmt ':
+                fmt = f.read(chunk_size)
+                if chunk_size % 2 == 1:
+                    f.read(1)
+            elif chunk_id == b'data':
+                data_offset = f.tell()
+                data_size = chunk_size
+                break
+            else:
+                f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+    if fmt is None:
+        raise ValueError(f'{path} has no fmt chunk before the data chunk')
+
+    audio_format, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+    if audio_format == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        audio_format = struct.unpack('<H', fmt[24:26])[0]
+    if audio_format == WAVE_FORMAT_PCM and bits in (8, 16, 32):
+        dtype = {8: np.uint8, 16: '<i2', 32: '<i4'}[bits]
+    elif audio_format == WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+        dtype = {32: '<f4', 64: '<f8'}[bits]
+    else:
+        raise ValueError(f'{path}: unsupported wav format (format tag {audio_format}, {bits} bits)')
+    return PCMSource(path, sample_rate, dtype, channels, data_offset, data_size)
+
+
+class ModulationLoader:
+    '''Streams WAV/raw PCM files into modulation buffers.
+
+    Files are memory-mapped, and only the source frames needed for a buffer are decoded and resampled to
+    config.mod_sample_freq. Each buffer has config.mod_buf_size samples. Decoded buffers are cached in an LRU keyed
+    on (path, mtime, offset, rate), so switching between segments of a long recording does not touch the file again.
+    '''
+
+    def __init__(self, config: Configuration = None, max_segments: int = 64, chunk_frames: int = 65536):
+        config = Configuration() if config is None else config
+        self.sample_freq = int(config.mod_sample_freq)
+        self.buf_size = int(config.mod_buf_size)
+        self.max_segments = max_segments
+        self.chunk_frames = chunk_frames
+        self._sources = {}
+        self._segments = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            for source in self._sources.values():
+                source.close()
+            self._sources.clear()
+            self._segments.clear()
+
+    def _source(self, path, sampling_freq, dtype):
+        path = os.path.abspath(path)
+        key = (path, os.stat(path).st_mtime_ns, sampling_freq, None if dtype is None else np.dtype(dtype).str)
+        with self._lock:
+            source = self._sources.get(key)
+            if source is None:
+                for old_key in [k for k in self._sources if k[0] == path]:
+                    self._sources.pop(old_key).close()
+                source = open_wav(path) if sampling_freq is None else open_raw_pcm(path, sampling_freq, dtype)
+                self._sources[key] = source
+        return key, source
+
+    def _decode(self, source, offset: float):
+        res = np.zeros(self.buf_size, dtype=np.float64)
+        ratio = source.sample_rate / self.sample_freq
+        start_pos = offset * source.sample_rate
+        # resample chunk by chunk so that only chunk_frames source frames are decoded at a time
+        step = max(1, int(self.chunk_frames / max(ratio, 1e-9)))
+        for begin in range(0, self.buf_size, step):
+            end = min(begin + step, self.buf_size)
+            pos = start_pos + np.arange(begin, end) * ratio
+            first = int(np.floor(pos[0]))
+            last = int(np.floor(pos[-1])) + 2
+            if first >= source.num_frames:
+                break
+            samples = source.read(first, last)
+            res[begin:end] = np.interp(pos - first, np.arange(len(samples)), samples, right=0.0)
+        return np.round(res * 255.0).astype(np.uint8)
+
+    def segment(self, path, offset: float = 0.0, sampling_freq: float = None, dtype=np.uint8):
+        '''uint8 modulation buffer of the file starting at offset [s].
+
+        path is a wav file, or a raw PCM file if sampling_freq is given (samples of dtype).
+        '''
+        source_key, source = self._source(path, sampling_freq, dtype)
+        key = (source_key[0], source_key[1], offset, self.sample_freq, self.buf_size) + source_key[2:]
+        with self._lock:
+            data = self._segments.get(key)
+            if data is not None:
+                self._segments.move_to_end(key)
+                return data
+        data = self._decode(source, offset)
+        data.setflags(write=False)
+        with self._lock:
+            self._segments[key] = data
+            while len(self._segments) > self.max_segments:
+                self._segments.popitem(last=False)
+        return data
+
+    def segments(self, path, offset: float = 0.0, duration: float = None, sampling_freq: float = None, dtype=np.uint8):
+        '''Yield consecutive modulation buffers from offset [s] until duration [s] or the end of the file.'''
+        _, source = self._source(path, sampling_freq, dtype)
+        end = source.duration if duration is None else min(source.duration, offset + duration)
+        seg_duration = self.buf_size / self.sample_freq
+        while offset < end:
+            yield self.segment(path, offset, sampling_freq, dtype)
+            offset += seg_duration
+
+    def modulation(self, path, offset: float = 0.0, sampling_freq: float = None, dtype=np.uint8):
+        return Modulation.custom(self.segment(path, offset, sampling_freq, dtype))